@@ -13,18 +13,16 @@ import json
 import os
 import re
 import sys
-from pathlib import Path
 
 # Add lib/ to path for sibling imports (store, fitness)
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Query-type detection patterns (ordered by specificity)
+# Query-type detection patterns (ordered by specificity). Matched against the
+# lowercased prompt without re.IGNORECASE, so keep literals lowercase.
 PATTERNS = {
     "code": [
         r"(?:write|create|implement|refactor|fix|debug|add|remove|update|modify)\s+(?:a\s+)?(?:function|class|method|component|test|script|hook|endpoint|module)",
-        r"```",
-        r"(?:TypeError|SyntaxError|ValueError|ImportError|KeyError|AttributeError)",
-        r"(?:how\s+(?:do|can|should)\s+I\s+(?:write|implement|create|build|make))",
+        r"(?:how\s+(?:do|can|should)\s+i\s+(?:write|implement|create|build|make))",
         r"\b(?:npm|pip|git|docker|pytest|eslint|webpack|cargo)\b",
     ],
     "diagnostic": [
@@ -36,13 +34,13 @@ PATTERNS = {
         r"(?:it\s+(?:keeps|just)\s+(?:failing|crashing|hanging|timing\s*out))",
     ],
     "claim": [
-        r"(?:is\s+it\s+true|I\s+(?:heard|read|think|believe)\s+that)",
+        r"(?:is\s+it\s+true|i\s+(?:heard|read|think|believe)\s+that)",
         r"(?:according\s+to|supposedly|they\s+say|isn't\s+it\s+(?:true|correct))",
         r"(?:verify|confirm|fact.?check|is\s+this\s+(?:correct|accurate|right))",
     ],
     "emotional": [
-        r"(?:I'm\s+(?:frustrated|stuck|confused|worried|overwhelmed|lost))",
-        r"(?:help\s+me\s+understand|I\s+don't\s+(?:get|understand))",
+        r"(?:i'm\s+(?:frustrated|stuck|confused|worried|overwhelmed|lost))",
+        r"(?:help\s+me\s+understand|i\s+don't\s+(?:get|understand))",
         r"(?:this\s+is\s+(?:driving\s+me\s+crazy|so\s+frustrating|impossible))",
     ],
     "meta": [
@@ -67,48 +65,77 @@ PATTERNS = {
         r"(?:explain\s+(?:the|how|why|what))",
         r"(?:describe\s+(?:the|how|what))",
         r"(?:(?:is|are)\s+there\s+(?:a|an|any)\b)",
-        r"(?:(?:do|does|did)\s+(?:we|you|I|it|this|that)\s+(?:need|have|want|require|support))",
+        r"(?:(?:do|does|did)\s+(?:we|you|i|it|this|that)\s+(?:need|have|want|require|support))",
     ],
     "conversational": [
         r"(?:^(?:yes|no|ok|okay|sure|thanks|thank\s+you|got\s+it|makes\s+sense|sounds\s+good|perfect|agreed|exactly|right|correct|nope|nah|great|nice|cool|alright|awesome)(?:\s|[.!,]|$))",
         r"(?:^(?:and|but|also|so|well|now|then|anyway|what\s+about|how\s+about|actually|hmm|ah|oh|sorry)(?:\s|[.!,]|$))",
-        r"(?:(?:thoughts|opinions?|ideas?)\s*\??\s*$)",
+        # One optional "?" group keeps this linear; "\s*\??\s*$" backtracks
+        # quadratically over long whitespace runs
+        r"(?:(?:thoughts|opinions?|ideas?)\s*(?:\?\s*)?$)",
         r"(?:(?:never\s*mind|forget\s+(?:it|that)|scratch\s+that))",
     ],
 }
 
+# Pure literal patterns, checked with substring tests on the lowercased prompt
+# instead of the regex engine. Each tuple counts as one pattern toward its
+# category's score when any of its literals occurs.
+LITERALS = {
+    "code": [
+        ("```",),
+        ("typeerror", "syntaxerror", "valueerror", "importerror", "keyerror", "attributeerror"),
+    ],
+}
+
+# Compiled once at import, in specificity order — the hook classifies every
+# prompt, so per-call pattern lookups are pure overhead.
+COMPILED = [
+    (category, LITERALS.get(category, []), [re.compile(p) for p in patterns])
+    for category, patterns in PATTERNS.items()
+]
+
 
 def classify(prompt: str) -> str:
     """Classify a prompt into a query type. Returns category string."""
     if not prompt or not prompt.strip():
         return "ambiguous"
 
-    prompt_lower = prompt.lower().strip()
+    # Lowercase once; case-folding inside the regex engine is ~2x slower
+    text = prompt.strip().lower()
 
-    # Check each category in order of specificity
-    scores = {}
-    for category, patterns in PATTERNS.items():
+    # Count matched patterns per category. Ties go to the earlier category
+    # (PATTERNS order is specificity priority), so a later category must score
+    # strictly higher to win, and a category stops scanning as soon as it can
+    # no longer beat the leader.
+    best_score = 0
+    best_category = "ambiguous"
+    for category, literal_sets, patterns in COMPILED:
         score = 0
+        for literals in literal_sets:
+            for literal in literals:
+                if literal in text:
+                    score += 1
+                    break
+        remaining = len(patterns)
         for pattern in patterns:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
+            if score + remaining <= best_score:
+                break
+            remaining -= 1
+            if pattern.search(text):
                 score += 1
-        if score > 0:
-            scores[category] = score
+        if score > best_score:
+            best_score = score
+            best_category = category
 
-    if not scores:
-        return "ambiguous"
-
-    # Highest score wins. Ties broken by specificity order.
-    max_score = max(scores.values())
-    for category in PATTERNS:
-        if scores.get(category) == max_score:
-            return category
-
-    return "ambiguous"
+    return best_category
 
 
 def _query_type_path():
-    """Path to the ephemeral query-type file."""
+    """Path to the ephemeral query-type file.
+
+    Resolved per call so it follows lcars_dir(); the directory creation it
+    implies is memoized in compat.
+    """
     from compat import lcars_dir
     return os.path.join(lcars_dir(), "query-type.tmp")
 
@@ -132,7 +159,6 @@ def read_classification() -> str:
 def _load_correction() -> str:
     """Read drift flag and return correction string. Consumes (deletes) the flag."""
     from store import read_and_clear_drift_flag
-    from fitness import record_correction
 
     drift = read_and_clear_drift_flag()
     if not drift:
@@ -140,6 +166,7 @@ def _load_correction() -> str:
 
     correction = drift.get("correction", "")
     if correction:
+        from fitness import record_correction
         record_correction(drift)
     return correction
 
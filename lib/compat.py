@@ -2,10 +2,24 @@
 
 Provides fcntl-equivalent locking on Windows via msvcrt.
 All file operations in the plugin use this module instead of fcntl directly.
+
+json_loads parses with orjson when it is installed and falls back to the
+stdlib otherwise; both accept str or bytes, and orjson's decode error
+subclasses json.JSONDecodeError, so callers handle one exception type.
+The parser is resolved on first use: importing orjson costs ~7ms (it pulls
+in uuid, zoneinfo, platform), which hooks that never parse JSONL skip.
+
+The readers here gate JSONL lines on their "epoch" before parsing.
+scores.jsonl and outcomes.jsonl are append-only in epoch order, so windows
+of those two are read from the tail. session-summaries.jsonl is not: cached
+summaries are re-appended with their original epochs.
 """
 
+import mmap
 import os
+import re
 import sys
+from contextlib import contextmanager
 
 
 def file_lock(f, exclusive=True):
@@ -28,15 +42,247 @@ def file_unlock(f):
         fcntl.flock(f, fcntl.LOCK_UN)
 
 
+# Directories already created by this process. Paths are still resolved on
+# every call (HOME may change, e.g. under test), but makedirs runs once each.
+_created_dirs = set()
+
+
+def _ensure_dir(d):
+    if d not in _created_dirs:
+        os.makedirs(d, exist_ok=True)
+        _created_dirs.add(d)
+    return d
+
+
+_loads = None
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes (orjson if available, else stdlib)."""
+    global _loads
+    if _loads is None:
+        try:
+            from orjson import loads as _loads
+        except ImportError:
+            from json import loads as _loads
+    return _loads(data)
+
+
+@contextmanager
+def locked_open(path, mode="r", exclusive=True):
+    """open() that holds a file lock for the duration of the with-block."""
+    with open(path, mode) as f:
+        file_lock(f, exclusive)
+        try:
+            yield f
+        finally:
+            file_unlock(f)
+
+
+@contextmanager
+def _locked_current(path, mode, buffering=-1):
+    """Open and exclusively lock the file currently at `path`.
+
+    trim_expired swaps a trimmed copy in with os.replace while holding the
+    lock, so a process that was waiting on it holds a lock on the unlinked
+    old file. The inode is re-checked once the lock is granted and the
+    open retried until it is the live file.
+    """
+    while True:
+        f = open(path, mode, buffering=buffering)
+        try:
+            file_lock(f)
+        except BaseException:
+            f.close()
+            raise
+        try:
+            current = os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+        except FileNotFoundError:
+            current = False
+        if current:
+            break
+        file_unlock(f)
+        f.close()
+    try:
+        yield f
+    finally:
+        file_unlock(f)
+        f.close()
+
+
+def _write_all(f, data):
+    """Write all of `data` to an unbuffered file, which may write less per call."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+def append_lines(path, lines, lock=False):
+    """Append text lines to a ledger in a single write.
+
+    On POSIX one write() to an O_APPEND descriptor lands atomically at EOF,
+    so concurrent appenders cannot interleave and no lock is needed. Windows
+    makes no such guarantee and takes the lock instead. Pass lock=True for
+    ledgers that are also rotated (see trim_expired), so the append waits
+    for the rotation and lands in the file that replaced the old one.
+    A short write is completed by further appends rather than left as a
+    truncated line.
+    """
+    data = "".join(line + "\n" for line in lines).encode()
+    if lock or sys.platform == "win32":
+        with _locked_current(path, "ab", buffering=0) as f:
+            _write_all(f, data)
+    else:
+        with open(path, "ab", buffering=0) as f:
+            _write_all(f, data)
+
+
+# Top-level "epoch" of a ledger line, read without parsing the whole entry
+_EPOCH_RE = re.compile(rb'"epoch":\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)')
+
+
+def line_epoch(line):
+    """Return the epoch of a raw JSONL line (bytes) without parsing it, or 0."""
+    m = _EPOCH_RE.search(line)
+    return float(m.group(1)) if m else 0.0
+
+
+def recent_lines(path, cutoff):
+    """Yield raw JSONL lines (bytes) whose epoch is >= cutoff.
+
+    Lines older than the cutoff are skipped before parsing, which is the
+    bulk of a long-lived ledger. A line without an epoch counts as epoch 0.
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            if line_epoch(line) >= cutoff:
+                yield line.strip()
+
+
+def reverse_lines(path):
+    """Yield non-empty JSONL lines (bytes) from EOF backward, via mmap.
+
+    Queries about the newest entries read only the tail of the ledger.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                line = mm[start:end].strip()
+                end = start - 1
+                if line:
+                    yield line
+
+
+def last_line(path):
+    """Return the last non-empty line of a file (bytes), or None if it has none."""
+    return next(reverse_lines(path), None)
+
+
+def tail_lines(path, cutoff):
+    """Return the trailing JSONL lines whose epoch is >= cutoff, oldest first.
+
+    Stops at the first older line, so cost tracks the window rather than the
+    whole ledger. Only for ledgers appended in epoch order (scores.jsonl,
+    outcomes.jsonl); on session-summaries.jsonl it would stop early at a
+    re-appended old summary, so use recent_lines there.
+    """
+    lines = []
+    for line in reverse_lines(path):
+        if line_epoch(line) < cutoff:
+            break
+        lines.append(line)
+    lines.reverse()
+    return lines
+
+
+def trim_expired(path, cutoff, chunk_size=1 << 20):
+    """Drop the leading JSONL lines whose epoch is < cutoff.
+
+    Expired entries are a prefix of an append-only ledger, so it is found
+    without parsing and the remainder is copied chunk by chunk to a temp
+    file that os.replace()s the ledger; memory stays constant and an
+    unexpired ledger is not rewritten at all. The old file is never
+    truncated, so readers that have it open or mapped (reverse_lines) keep
+    a consistent view, and a kill mid-copy leaves the ledger untouched.
+    Windows cannot replace an open file and compacts in place instead.
+    Runs under file_lock, so appenders must use append_lines(..., lock=True)
+    to land in the new file rather than the replaced one.
+    """
+    with _locked_current(path, "r+b") as f:
+        offset = 0
+        for line in f:
+            if line_epoch(line) >= cutoff:
+                break
+            offset += len(line)
+        if offset == 0:
+            return
+        if sys.platform == "win32":
+            # Windows cannot replace a file that is open (f included), so
+            # copy down in place; a mapped reader makes the truncate fail
+            # there rather than fault.
+            read_pos, write_pos = offset, 0
+            while True:
+                f.seek(read_pos)
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                f.seek(write_pos)
+                f.write(chunk)
+                read_pos += len(chunk)
+                write_pos += len(chunk)
+            f.truncate(write_pos)
+            return
+        f.seek(offset)
+        tmp = f"{path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp, "wb") as out:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def replace_file(path, data):
+    """Replace a small state file's contents (str) atomically.
+
+    Writes a per-process temp file beside it and os.replace()s it into
+    place, so readers see the old or the new contents, never a truncated
+    one, and writers need no lock. Last writer wins.
+    """
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
 def lcars_dir():
     """Return the plugin runtime data directory, creating it if needed."""
-    d = os.path.join(os.path.expanduser("~"), ".claude", "lcars")
-    os.makedirs(d, exist_ok=True)
-    return d
+    return _ensure_dir(os.path.join(os.path.expanduser("~"), ".claude", "lcars"))
 
 
 def lcars_memory_dir():
     """Return the plugin memory subdirectory, creating it if needed."""
-    d = os.path.join(lcars_dir(), "memory")
-    os.makedirs(d, exist_ok=True)
-    return d
+    return _ensure_dir(os.path.join(lcars_dir(), "memory"))
+
+
+def sampled(rate):
+    """True for roughly `rate` of calls. Used to amortize periodic maintenance.
+
+    Each call is an independent draw from os.urandom rather than random,
+    whose imports cost ~1.7ms in every short-lived hook process. Gates in
+    the same process (score.py's rotate and learn passes, the discover
+    scan behind the latter) therefore fire independently of each other.
+    """
+    return int.from_bytes(os.urandom(2), "big") < rate * 65536
@@ -17,10 +17,10 @@ import sys
 import time
 from collections import Counter
 from datetime import datetime
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent))
-from compat import file_lock, file_unlock, lcars_dir, lcars_memory_dir
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from compat import (append_lines, json_loads, lcars_dir, lcars_memory_dir, line_epoch,
+                    locked_open, recent_lines, reverse_lines, sampled, tail_lines)
 
 SUMMARIES_FILE = os.path.join(lcars_memory_dir(), "session-summaries.jsonl")
 PATTERNS_FILE = os.path.join(lcars_memory_dir(), "patterns.json")
@@ -54,12 +54,12 @@ def _segment_sessions_with_keys(scores_path: str) -> list[tuple[float, list[dict
 
     entries = []
     try:
-        with open(scores_path) as f:
+        with open(scores_path, "rb") as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
-                entries.append(json.loads(line))
+                entries.append(json_loads(line))
     except (json.JSONDecodeError, OSError):
         return []
 
@@ -82,6 +82,31 @@ def _segment_sessions_with_keys(scores_path: str) -> list[tuple[float, list[dict
     return result
 
 
+def _aggregate(scores: list[dict]) -> dict:
+    """Summary fields shared by segment and time-window summaries.
+
+    scores must be non-empty.
+    """
+    n = len(scores)
+
+    # drift_types is a set of at most two flags — stop at the first hit of each
+    drift_types = []
+    if any(s.get("padding_count", 0) > 0 for s in scores):
+        drift_types.append("filler")
+    if any(s.get("answer_position", 0) > 0 for s in scores):
+        drift_types.append("preamble")
+    query_types = Counter(s.get("query_type", "ambiguous") for s in scores)
+
+    avg_density = sum(s.get("info_density", 0) for s in scores) / n
+
+    return {
+        "responses": n,
+        "avg_density": round(avg_density, 3),
+        "drift_types": drift_types,
+        "query_types": dict(query_types),
+    }
+
+
 def summarize_session(segment: list[dict]) -> dict:
     """Summarize a session segment into the same format as extract_session_summary.
 
@@ -95,100 +120,88 @@ def summarize_session(segment: list[dict]) -> dict:
     if not scores:
         return {}
 
-    n = len(scores)
-    drift_types = []
-    query_types = Counter()
-
-    for s in scores:
-        if s.get("padding_count", 0) > 0:
-            drift_types.append("filler")
-        if s.get("answer_position", 0) > 0:
-            drift_types.append("preamble")
-        qt = s.get("query_type", "ambiguous")
-        query_types[qt] += 1
-
-    avg_density = sum(s.get("info_density", 0) for s in scores) / n
-
     # Use the first score's epoch/date for the session timestamp
     first_epoch = scores[0].get("epoch", 0)
     date = datetime.fromtimestamp(first_epoch).strftime("%Y-%m-%d") if first_epoch else ""
 
-    return {
-        "epoch": first_epoch,
-        "date": date,
-        "responses": n,
-        "avg_density": round(avg_density, 3),
-        "drift_types": list(set(drift_types)),
-        "query_types": dict(query_types),
-    }
+    return {"epoch": first_epoch, "date": date, **_aggregate(scores)}
 
 
 def extract_session_summary(scores_file: str) -> dict | None:
     """Extract a summary from the current session's scores.
 
     Called by PreCompact hook before context is compressed.
-    Reads recent scores (last 2 hours) and summarizes drift patterns.
+    Reads recent scores (last 2 hours, from the tail of the ledger) and
+    summarizes drift patterns.
     """
     if not os.path.exists(scores_file):
         return None
 
     cutoff = time.time() - 7200  # last 2 hours = approximate session
-    session_scores = []
 
+    # scores.jsonl is appended in epoch order, as tail_lines requires; the
+    # summaries ledger is not (see compat.tail_lines)
     try:
-        with open(scores_file) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    session_scores.append(entry)
+        session_scores = [json_loads(line) for line in tail_lines(scores_file, cutoff)]
     except (json.JSONDecodeError, OSError):
         return None
 
     if not session_scores:
         return None
 
-    n = len(session_scores)
-    drift_types = []
-    query_types = Counter()
-
-    for s in session_scores:
-        if s.get("padding_count", 0) > 0:
-            drift_types.append("filler")
-        if s.get("answer_position", 0) > 0:
-            drift_types.append("preamble")
-        qt = s.get("query_type", "ambiguous")
-        query_types[qt] += 1
-
-    avg_density = sum(s.get("info_density", 0) for s in session_scores) / n
-
     return {
         "epoch": time.time(),
         "date": datetime.now().strftime("%Y-%m-%d"),
-        "responses": n,
-        "avg_density": round(avg_density, 3),
-        "drift_types": list(set(drift_types)),
-        "query_types": dict(query_types),
+        **_aggregate(session_scores),
     }
 
 
+def _last_session(scores_path: str) -> tuple[float, list[dict]] | None:
+    """Return (marker_epoch, segment) of the newest non-empty session.
+
+    Equivalent to _segment_sessions_with_keys(scores_path)[-1], but reads
+    backward from EOF and stops at the session's marker. Scores with no
+    marker before them get key 0, as in the forward segmentation.
+    """
+    # Stdlib json on purpose: SessionStart parses one session's lines and the
+    # small summaries ledger, ~1ms, and imports orjson nowhere else, which
+    # would cost ~7ms in the fresh hook process. PreCompact's learning pass
+    # imports it anyway, so everything else in this module uses json_loads.
+    segment = []
+    for line in reverse_lines(scores_path):
+        entry = json.loads(line)
+        if entry.get("type") == "session_start":
+            if segment:
+                segment.reverse()
+                return entry.get("epoch", 0.0), segment
+            continue  # empty session (e.g. the one just started)
+        segment.append(entry)
+    if segment:
+        segment.reverse()
+        return 0.0, segment
+    return None
+
+
 def summarize_previous_session(scores_path: str | None = None) -> dict | None:
     """Summarize the most recent complete session and cache it.
 
     Called by SessionStart after writing the new session marker.
-    The just-started session has no scores yet, so _segment_sessions_with_keys
-    excludes it — the previous session is result[-1].
+    The just-started session has no scores yet, so it is skipped as empty —
+    the previous session is the newest non-empty one, read from the tail.
     """
     if scores_path is None:
         scores_path = SCORES_FILE
 
-    keyed = _segment_sessions_with_keys(scores_path)
-    if not keyed:
+    if not os.path.exists(scores_path):
+        return None
+    try:
+        last = _last_session(scores_path)
+    except (json.JSONDecodeError, OSError):
+        return None
+    if not last:
         return None
 
-    marker_epoch, segment = keyed[-1]
+    marker_epoch, segment = last
 
     # Epoch-0 segments are pre-first-marker scores — not real sessions
     if marker_epoch <= 0:
@@ -209,10 +222,7 @@ def summarize_previous_session(scores_path: str | None = None) -> dict | None:
 
 def append_summary(summary: dict):
     """Append a session summary to the summaries ledger."""
-    with open(SUMMARIES_FILE, "a") as f:
-        file_lock(f)
-        f.write(json.dumps(summary) + "\n")
-        file_unlock(f)
+    append_lines(SUMMARIES_FILE, [json.dumps(summary)])
 
 
 def load_summaries(days: int = SUMMARY_RETENTION_DAYS) -> list[dict]:
@@ -221,40 +231,52 @@ def load_summaries(days: int = SUMMARY_RETENTION_DAYS) -> list[dict]:
         return []
 
     cutoff = time.time() - (days * 86400)
-    summaries = []
 
     try:
-        with open(SUMMARIES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    summaries.append(entry)
+        return [json_loads(line) for line in recent_lines(SUMMARIES_FILE, cutoff)]
     except (json.JSONDecodeError, OSError):
         return []
 
-    return summaries
-
 
 def _load_cached_epochs() -> set[float]:
     """Load marker epochs already cached in session-summaries.jsonl."""
+    return _load_summary_cache()[0]
+
+
+def _load_summary_cache(days: int = SUMMARY_RETENTION_DAYS) -> tuple[set[float], list[dict]]:
+    """Read session-summaries.jsonl once for both of consolidate()'s needs.
+
+    Returns (marker epochs already cached, summaries within `days`) — the
+    results of _load_cached_epochs() and load_summaries() from a single pass.
+    As in load_summaries(), the window is gated on the raw line's epoch, so a
+    corrupt line outside it is skipped, while one inside it empties the list.
+    """
     if not os.path.exists(SUMMARIES_FILE):
-        return set()
+        return set(), []
+
+    cutoff = time.time() - (days * 86400)
     epochs = set()
+    summaries = []
     try:
-        with open(SUMMARIES_FILE) as f:
+        with open(SUMMARIES_FILE, "rb") as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
-                entry = json.loads(line)
+                recent = line_epoch(line) >= cutoff
+                try:
+                    entry = json.loads(line)  # SessionStart path: see _last_session
+                except json.JSONDecodeError:
+                    if recent:
+                        summaries = None
+                    continue
                 if "_marker_epoch" in entry:
                     epochs.add(entry["_marker_epoch"])
-    except (json.JSONDecodeError, OSError):
-        pass
-    return epochs
+                if recent and summaries is not None:
+                    summaries.append(entry)
+    except OSError:
+        summaries = []
+    return epochs, summaries or []
 
 
 def consolidate(scores_path: str | None = None) -> dict:
@@ -272,10 +294,12 @@ def consolidate(scores_path: str | None = None) -> dict:
     # Build summaries from scores.jsonl segments
     keyed_segments = _segment_sessions_with_keys(scores_path)
 
-    # Load cached summaries (keyed by marker epoch) to avoid recomputation
-    cached_epochs = _load_cached_epochs()
+    # Load cached summaries (keyed by marker epoch) to avoid recomputation;
+    # the same pass yields the fallback summaries below
+    cached_epochs, cached_summaries = _load_summary_cache()
 
     summaries = []
+    new_cache_lines = []
     retention_cutoff = time.time() - (SUMMARY_RETENTION_DAYS * 86400)
 
     for marker_epoch, segment in keyed_segments:
@@ -291,48 +315,55 @@ def consolidate(scores_path: str | None = None) -> dict:
         # Cache new summaries for future runs
         if marker_epoch not in cached_epochs and marker_epoch > 0:
             cache_entry = {**summary, "_marker_epoch": marker_epoch}
-            append_summary(cache_entry)
+            new_cache_lines.append(json.dumps(cache_entry))
 
         summaries.append(summary)
 
+    # One append for all newly cached summaries
+    if new_cache_lines:
+        append_lines(SUMMARIES_FILE, new_cache_lines)
+
     # If no segments found in scores.jsonl, fall back to cached summaries
     if not summaries:
-        summaries = load_summaries()
+        summaries = cached_summaries
 
     if len(summaries) < MIN_SESSIONS:
         return {"status": "insufficient_data", "sessions": len(summaries), "required": MIN_SESSIONS}
 
-    # Count drift type occurrences across sessions and calendar days
-    drift_sessions = {}  # drift_type -> list of dates
+    # Count drift type occurrences across sessions and calendar days:
+    # drift_type -> Counter of dates. Session count, unique days and first/last
+    # seen all reduce from it without keeping one entry per session.
+    drift_days = {}
     for s in summaries:
         date = s.get("date", "")
         for dt in s.get("drift_types", []):
-            drift_sessions.setdefault(dt, []).append(date)
+            drift_days.setdefault(dt, Counter())[date] += 1
 
     # Apply overfit gates
     new_patterns = []
-    for drift_type, dates in drift_sessions.items():
-        session_count = len(dates)
-        unique_days = len(set(dates))
+    for drift_type, days in drift_days.items():
+        session_count = sum(days.values())
+        unique_days = len(days)
 
         if session_count >= MIN_SESSIONS and unique_days >= MIN_CALENDAR_DAYS:
             new_patterns.append({
                 "drift_type": drift_type,
                 "sessions": session_count,
                 "unique_days": unique_days,
-                "first_seen": min(dates),
-                "last_seen": max(dates),
+                "first_seen": min(days),
+                "last_seen": max(days),
                 "status": "validated",
             })
 
     # Load existing patterns
     existing = _load_patterns()
     existing_types = {p["drift_type"] for p in existing if p.get("status") == "validated"}
+    new_types = {np["drift_type"] for np in new_patterns}
 
     # Contradiction check: if a previously validated pattern no longer meets gates, mark stale
     stale = []
     for p in existing:
-        if p.get("status") == "validated" and p["drift_type"] not in {np["drift_type"] for np in new_patterns}:
+        if p.get("status") == "validated" and p["drift_type"] not in new_types:
             p["status"] = "stale"
             stale.append(p["drift_type"])
 
@@ -365,10 +396,8 @@ def _load_patterns() -> list[dict]:
 
 
 def _save_patterns(patterns: list[dict]):
-    with open(PATTERNS_FILE, "w") as f:
-        file_lock(f)
+    with locked_open(PATTERNS_FILE, "w") as f:
         json.dump(patterns, f, indent=2)
-        file_unlock(f)
 
 
 def rotate_summaries():
@@ -377,24 +406,14 @@ def rotate_summaries():
         return
 
     cutoff = time.time() - (SUMMARY_RETENTION_DAYS * 86400)
-    kept = []
 
     try:
-        with open(SUMMARIES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    kept.append(line)
-    except (json.JSONDecodeError, OSError):
+        kept = list(recent_lines(SUMMARIES_FILE, cutoff))
+    except OSError:
         return
 
-    with open(SUMMARIES_FILE, "w") as f:
-        file_lock(f)
-        f.write("\n".join(kept) + "\n" if kept else "")
-        file_unlock(f)
+    with locked_open(SUMMARIES_FILE, "wb") as f:
+        f.write(b"\n".join(kept) + b"\n" if kept else b"")
 
 
 def run_learning_pass(scores_path: str | None = None) -> dict | None:
@@ -403,8 +422,6 @@ def run_learning_pass(scores_path: str | None = None) -> dict | None:
     Called by the Stop hook (amortized) and PreCompact hook. Extracted so both
     hooks can trigger learning without duplicating logic.
     """
-    import random
-
     rotate_summaries()
     result = consolidate(scores_path)
 
@@ -424,7 +441,7 @@ def run_learning_pass(scores_path: str | None = None) -> dict | None:
         pass
 
     # Amortized environment scan (~5% of learning passes)
-    if random.random() < 0.05:
+    if sampled(0.05):
         try:
             from discover import scan
             scan()
@@ -7,7 +7,6 @@ with naturally lower density are not flagged).
 
 import json
 import os
-from pathlib import Path
 
 # Severity classification margins
 HIGH_FILLER_COUNT = 3
@@ -15,19 +14,46 @@ HIGH_PREAMBLE_WORDS = 10
 HIGH_DENSITY_MARGIN = 0.10  # threshold - score > this = high severity
 
 
+# File-relative plugin root, resolved once; CLAUDE_PLUGIN_ROOT is still read
+# per call since it can be set after import
+_DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 def _plugin_root():
-    return Path(os.environ.get("CLAUDE_PLUGIN_ROOT", Path(__file__).parent.parent))
+    return os.environ.get("CLAUDE_PLUGIN_ROOT", _DEFAULT_ROOT)
+
+
+# path -> ((mtime_ns, size), index); rebuilt only when the file changes
+_corrections_cache = {}
 
 
-def _load_corrections() -> list[dict]:
-    """Load correction strategies from the decision table."""
-    path = _plugin_root() / "data" / "corrections.json"
+def _load_corrections() -> dict[tuple[str, str, str], dict]:
+    """Load correction strategies indexed by (drift, severity, query).
+
+    Cached per path and keyed on the file's mtime and size, so edits made by
+    /foundry are picked up without re-parsing on every detect() call. When
+    the table repeats a key, the first entry wins.
+    """
+    path = os.path.join(_plugin_root(), "data", "corrections.json")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _corrections_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     try:
         with open(path) as f:
             data = json.load(f)
-        return data.get("strategies", [])
     except (OSError, json.JSONDecodeError):
-        return []
+        return {}
+    index = {}
+    for strategy in data.get("strategies", []):
+        key = (strategy.get("drift"), strategy.get("severity", "*"), strategy.get("query", "*"))
+        index.setdefault(key, strategy)
+    _corrections_cache[path] = (stamp, index)
+    return index
 
 
 def detect(score: dict, query_type: str = "ambiguous") -> dict | None:
@@ -42,27 +68,28 @@ def detect(score: dict, query_type: str = "ambiguous") -> dict | None:
         Dict includes: categories (list), severity, reasons (list), correction (str).
     """
     # Import here to avoid circular dependency at module level
-    from thresholds import get as get_threshold
+    from thresholds import get_all as get_thresholds
 
     categories = []
     reasons = []
+    thresholds = get_thresholds(query_type)
 
     # Filler check
-    filler_threshold = get_threshold("filler", query_type)
+    filler_threshold = thresholds["filler"]
     padding = score.get("padding_count", 0)
     if padding > filler_threshold:
         categories.append("filler")
         reasons.append(f"filler:{padding}")
 
     # Preamble check
-    preamble_threshold = get_threshold("preamble", query_type)
+    preamble_threshold = thresholds["preamble"]
     position = score.get("answer_position", 0)
     if position > preamble_threshold:
         categories.append("preamble")
         reasons.append(f"preamble:{position}w")
 
     # Density check
-    density_threshold = get_threshold("density", query_type)
+    density_threshold = thresholds["density"]
     density = score.get("info_density", 1.0)
     if density < density_threshold:
         categories.append("density")
@@ -86,9 +113,9 @@ def detect(score: dict, query_type: str = "ambiguous") -> dict | None:
         "reasons": reasons,
         "correction": correction,
         "query_type": query_type,
-        "padding_count": score.get("padding_count", 0),
-        "answer_position": score.get("answer_position", 0),
-        "info_density": score.get("info_density", 0),
+        "padding_count": padding,
+        "answer_position": position,
+        "info_density": score.get("info_density", 0),  # 0, not the 1.0 check default
     }
 
 
@@ -128,37 +155,15 @@ def elevate_severity(drift_result: dict | None, judge_scores: dict) -> dict | No
 def _select_correction(drift_type: str, severity: str, query_type: str,
                        score: dict, reasons: list) -> str:
     """Select correction template from the decision table and format it."""
-    strategies = _load_corrections()
+    index = _load_corrections()
 
-    # Find best match: exact drift+severity+query > drift+severity+wildcard > drift+wildcard+wildcard
+    # Most specific match wins: exact severity outranks exact query type,
+    # which outranks the drift-only wildcard
     best = None
-    best_specificity = -1
-
-    for strategy in strategies:
-        if strategy.get("drift") != drift_type:
-            continue
-
-        s_severity = strategy.get("severity", "*")
-        s_query = strategy.get("query", "*")
-
-        specificity = 0
-        if s_severity == severity:
-            specificity += 2
-        elif s_severity == "*":
-            specificity += 0
-        else:
-            continue  # severity doesn't match
-
-        if s_query == query_type:
-            specificity += 1
-        elif s_query == "*":
-            specificity += 0
-        else:
-            continue  # query type doesn't match
-
-        if specificity > best_specificity:
-            best = strategy
-            best_specificity = specificity
+    for key in ((severity, query_type), (severity, "*"), ("*", query_type), ("*", "*")):
+        best = index.get((drift_type, *key))
+        if best is not None:
+            break
 
     if not best:
         # Fallback: generic correction
@@ -16,7 +16,7 @@ import json
 import os
 import time
 
-from compat import file_lock, file_unlock, lcars_dir, lcars_memory_dir
+from compat import append_lines, json_loads, lcars_dir, lcars_memory_dir, replace_file, tail_lines
 
 PENDING_FILE = os.path.join(lcars_dir(), "pending-correction.json")
 OUTCOMES_FILE = os.path.join(lcars_memory_dir(), "correction-outcomes.jsonl")
@@ -39,10 +39,7 @@ def record_correction(drift_details: dict):
             "info_density": drift_details.get("info_density", 0),
         },
     }
-    with open(PENDING_FILE, "w") as f:
-        file_lock(f)
-        json.dump(pending, f)
-        file_unlock(f)
+    replace_file(PENDING_FILE, json.dumps(pending))
 
 
 def evaluate_correction(post_score: dict) -> dict | None:
@@ -51,21 +48,24 @@ def evaluate_correction(post_score: dict) -> dict | None:
     Returns outcome dict if there was a pending correction, None otherwise.
     Clears the pending file after evaluation.
     """
-    if not os.path.exists(PENDING_FILE):
+    # Claim the pending file by renaming it, so exactly one evaluator
+    # consumes it even when hooks overlap
+    claimed = f"{PENDING_FILE}.{os.getpid()}.consuming"
+    try:
+        os.rename(PENDING_FILE, claimed)
+    except OSError:
         return None
 
     try:
-        with open(PENDING_FILE) as f:
-            file_lock(f, exclusive=False)
+        with open(claimed) as f:
             pending = json.load(f)
-            file_unlock(f)
-        os.unlink(PENDING_FILE)
     except (json.JSONDecodeError, OSError):
+        return None
+    finally:
         try:
-            os.unlink(PENDING_FILE)
+            os.unlink(claimed)
         except OSError:
             pass
-        return None
 
     # Stale pending corrections (> 24h) are discarded
     if time.time() - pending.get("epoch", 0) > 86400:
@@ -98,41 +98,32 @@ def evaluate_correction(post_score: dict) -> dict | None:
         "details": {cat: imp for cat, imp in zip(categories, improvements)},
     }
 
-    # Append outcome
-    with open(OUTCOMES_FILE, "a") as f:
-        file_lock(f)
-        f.write(json.dumps(outcome) + "\n")
-        file_unlock(f)
+    # Append outcome (one small line; append_lines needs no lock on POSIX)
+    append_lines(OUTCOMES_FILE, [json.dumps(outcome)])
 
     return outcome
 
 
 def fitness_rate(days: int = 30) -> dict | None:
-    """Compute correction fitness rate over recent outcomes."""
-    if not os.path.exists(OUTCOMES_FILE):
-        return None
+    """Compute correction fitness rate over recent outcomes.
 
+    Reads only the window at the tail of the outcomes ledger.
+    """
     cutoff = time.time() - (days * 86400)
-    outcomes = []
+    total = 0
+    effective = 0
 
     try:
-        with open(OUTCOMES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    outcomes.append(entry)
+        for line in tail_lines(OUTCOMES_FILE, cutoff):
+            total += 1
+            if json_loads(line).get("effective"):
+                effective += 1
     except (json.JSONDecodeError, OSError):
         return None
 
-    if not outcomes:
+    if not total:
         return None
 
-    total = len(outcomes)
-    effective = sum(1 for o in outcomes if o.get("effective"))
-
     return {
         "total": total,
         "effective": effective,
@@ -19,7 +19,7 @@ import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from compat import file_lock, file_unlock, lcars_memory_dir
+from compat import json_loads, lcars_memory_dir, replace_file, tail_lines
 
 STAGED_FILE = os.path.join(lcars_memory_dir(), "staged-strategies.json")
 OUTCOMES_FILE = os.path.join(lcars_memory_dir(), "correction-outcomes.jsonl")
@@ -45,8 +45,6 @@ def _load_corrections() -> dict:
 
 
 def _load_patterns() -> list[dict]:
-    if not os.path.exists(PATTERNS_FILE):
-        return []
     try:
         with open(PATTERNS_FILE) as f:
             return json.load(f)
@@ -55,27 +53,14 @@ def _load_patterns() -> list[dict]:
 
 
 def _load_outcomes(days: int = 30) -> list[dict]:
-    if not os.path.exists(OUTCOMES_FILE):
-        return []
     cutoff = time.time() - (days * 86400)
-    outcomes = []
     try:
-        with open(OUTCOMES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    outcomes.append(entry)
+        return [json_loads(line) for line in tail_lines(OUTCOMES_FILE, cutoff)]
     except (json.JSONDecodeError, OSError):
-        pass
-    return outcomes
+        return []
 
 
 def _load_staged() -> list[dict]:
-    if not os.path.exists(STAGED_FILE):
-        return []
     try:
         with open(STAGED_FILE) as f:
             return json.load(f)
@@ -84,10 +69,12 @@ def _load_staged() -> list[dict]:
 
 
 def _save_staged(proposals: list[dict]):
-    with open(STAGED_FILE, "w") as f:
-        file_lock(f)
-        json.dump(proposals, f, indent=2)
-        file_unlock(f)
+    replace_file(STAGED_FILE, json.dumps(proposals, indent=2))
+
+
+def _proposal_key(proposal: dict) -> tuple:
+    """Identity of a staged proposal, for deduplication."""
+    return (proposal["type"], proposal.get("drift"), proposal.get("severity"), proposal.get("query"))
 
 
 def _strategy_exists(strategies: list[dict], drift: str, severity: str, query: str) -> bool:
@@ -104,32 +91,30 @@ def analyze() -> dict:
     Returns a report with any new proposals staged (both correction strategies
     and tool crystallization candidates).
     """
-    corrections = _load_corrections()
-    strategies = corrections.get("strategies", [])
     patterns = _load_patterns()
     outcomes = _load_outcomes()
     existing_staged = _load_staged()
 
     proposals = []
 
-    # 1. Gap filling: validated patterns without query-type-specific strategies
-    proposals.extend(_find_gaps(patterns, strategies, outcomes))
+    # Every strategy proposal needs MIN_OUTCOMES_FOR_REFINEMENT outcomes for
+    # one drift type, so with fewer outcomes in total there is nothing to find
+    if len(outcomes) >= MIN_OUTCOMES_FOR_REFINEMENT:
+        strategies = _load_corrections().get("strategies", [])
+        by_drift_query, by_drift = _aggregate_outcomes(outcomes)
 
-    # 2. Refinement: strategies with low fitness for specific query types
-    proposals.extend(_find_refinements(strategies, outcomes))
+        # 1. Gap filling: validated patterns without query-type-specific strategies
+        proposals.extend(_find_gaps(patterns, strategies, by_drift_query))
 
-    # 3. Suppression: strategies that fire often but don't help
-    proposals.extend(_find_suppressions(strategies, outcomes))
+        # 2. Refinement: strategies with low fitness for specific query types
+        proposals.extend(_find_refinements(strategies, by_drift_query))
+
+        # 3. Suppression: strategies that fire often but don't help
+        proposals.extend(_find_suppressions(by_drift, len(outcomes)))
 
     # Deduplicate against existing staged proposals
-    existing_keys = {
-        (p["type"], p.get("drift"), p.get("severity"), p.get("query"))
-        for p in existing_staged
-    }
-    new_proposals = [
-        p for p in proposals
-        if (p["type"], p.get("drift"), p.get("severity"), p.get("query")) not in existing_keys
-    ]
+    existing_keys = set(map(_proposal_key, existing_staged))
+    new_proposals = [p for p in proposals if _proposal_key(p) not in existing_keys]
 
     if new_proposals:
         all_staged = existing_staged + new_proposals
@@ -148,20 +133,27 @@ def analyze() -> dict:
     }
 
 
-def _find_gaps(patterns: list, strategies: list, outcomes: list) -> list[dict]:
-    """Find validated drift patterns without query-type-specific strategies."""
-    proposals = []
+def _aggregate_outcomes(outcomes: list) -> tuple[dict, dict]:
+    """Count outcomes per (drift, query_type) and per drift in one pass.
 
-    # Get query types that appear in outcomes
-    query_drift_counts = {}
+    Both maps hold {"total", "effective"} counts, in first-seen key order.
+    """
+    by_drift_query = {}
+    by_drift = {}
     for o in outcomes:
         qt = o.get("query_type", "ambiguous")
+        effective = 1 if o.get("effective") else 0
         for cat in o.get("categories", []):
-            key = (cat, qt)
-            query_drift_counts.setdefault(key, {"total": 0, "effective": 0})
-            query_drift_counts[key]["total"] += 1
-            if o.get("effective"):
-                query_drift_counts[key]["effective"] += 1
+            for counts in (by_drift_query.setdefault((cat, qt), {"total": 0, "effective": 0}),
+                           by_drift.setdefault(cat, {"total": 0, "effective": 0})):
+                counts["total"] += 1
+                counts["effective"] += effective
+    return by_drift_query, by_drift
+
+
+def _find_gaps(patterns: list, strategies: list, query_drift_counts: dict) -> list[dict]:
+    """Find validated drift patterns without query-type-specific strategies."""
+    proposals = []
 
     for pattern in patterns:
         if pattern.get("status") != "validated":
@@ -195,24 +187,17 @@ def _find_gaps(patterns: list, strategies: list, outcomes: list) -> list[dict]:
     return proposals
 
 
-def _find_refinements(strategies: list, outcomes: list) -> list[dict]:
+def _find_refinements(strategies: list, query_drift_counts: dict) -> list[dict]:
     """Find strategies with low effectiveness for specific query types."""
     proposals = []
 
-    # Group outcomes by (drift_type, query_type)
-    grouped = {}
-    for o in outcomes:
-        qt = o.get("query_type", "ambiguous")
-        for cat in o.get("categories", []):
-            key = (cat, qt)
-            grouped.setdefault(key, []).append(o)
-
-    for (drift_type, qt), group in grouped.items():
-        if len(group) < MIN_OUTCOMES_FOR_REFINEMENT:
+    for (drift_type, qt), counts in query_drift_counts.items():
+        total = counts["total"]
+        if total < MIN_OUTCOMES_FOR_REFINEMENT:
             continue
 
-        effective = sum(1 for o in group if o.get("effective"))
-        fitness = effective / len(group)
+        effective = counts["effective"]
+        fitness = effective / total
 
         if fitness < LOW_FITNESS_THRESHOLD:
             # Check if there's already a specific strategy for this combo
@@ -226,33 +211,22 @@ def _find_refinements(strategies: list, outcomes: list) -> list[dict]:
                     "severity": "*",
                     "query": qt,
                     "reason": f"Existing {drift_type} strategy for {qt} queries has "
-                              f"fitness {fitness:.2f} ({effective}/{len(group)}). Needs revision.",
+                              f"fitness {fitness:.2f} ({effective}/{total}). Needs revision.",
                     "suggestion": _suggest_template(drift_type, qt),
-                    "evidence": {"total": len(group), "effective": effective, "rate": fitness},
+                    "evidence": {"total": total, "effective": effective, "rate": fitness},
                     "epoch": time.time(),
                 })
 
     return proposals
 
 
-def _find_suppressions(strategies: list, outcomes: list) -> list[dict]:
+def _find_suppressions(drift_counts: dict, total_outcomes: int) -> list[dict]:
     """Find strategies that fire frequently but don't help."""
     proposals = []
 
-    if len(outcomes) < MIN_OUTCOMES_FOR_REFINEMENT:
+    if total_outcomes < MIN_OUTCOMES_FOR_REFINEMENT:
         return proposals
 
-    # Count how often each drift type appears and its effectiveness
-    drift_counts = {}
-    for o in outcomes:
-        for cat in o.get("categories", []):
-            drift_counts.setdefault(cat, {"total": 0, "effective": 0})
-            drift_counts[cat]["total"] += 1
-            if o.get("effective"):
-                drift_counts[cat]["effective"] += 1
-
-    total_outcomes = len(outcomes)
-
     for drift_type, counts in drift_counts.items():
         fire_rate = counts["total"] / total_outcomes
         fitness = counts["effective"] / counts["total"] if counts["total"] else 0
@@ -308,12 +282,12 @@ def _find_tool_candidates() -> list[dict]:
     # Read tool usage entries
     entries = []
     try:
-        with open(tool_log) as f:
+        with open(tool_log, "rb") as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
-                entry = json.loads(line)
+                entry = json_loads(line)
                 if entry.get("type") != "session_start":
                     entries.append(entry)
     except (json.JSONDecodeError, OSError):
@@ -432,10 +406,7 @@ def apply_proposals(indices: list[int]) -> dict:
     corrections["version"] = corrections.get("version", 1) + 1
 
     path = _plugin_root() / "data" / "corrections.json"
-    with open(path, "w") as f:
-        file_lock(f)
-        json.dump(corrections, f, indent=2)
-        file_unlock(f)
+    replace_file(str(path), json.dumps(corrections, indent=2))
 
     _save_staged(staged)
 
@@ -15,38 +15,43 @@ Outputs JSON with hookSpecificOutput.additionalContext.
 import json
 import os
 import sys
-from pathlib import Path
 
-PLUGIN_ROOT = Path(os.environ.get("CLAUDE_PLUGIN_ROOT", Path(__file__).parent.parent))
-DATA_DIR = PLUGIN_ROOT / "data"
+_LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_ROOT = os.environ.get("CLAUDE_PLUGIN_ROOT", os.path.dirname(_LIB_DIR))
+DATA_DIR = os.path.join(PLUGIN_ROOT, "data")
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, _LIB_DIR)
 from store import last_score_age_hours, rolling_stats, append_session_marker
 
 
 def _plugin_version() -> str | None:
     """Read version from plugin.json."""
-    path = PLUGIN_ROOT / ".claude-plugin" / "plugin.json"
+    path = os.path.join(PLUGIN_ROOT, ".claude-plugin", "plugin.json")
     try:
-        return json.loads(path.read_text()).get("version")
+        with open(path) as f:
+            return json.load(f).get("version")
     except (OSError, json.JSONDecodeError):
         return None
 
 
 def load_anchor() -> str:
     """Behavioral anchor. Always injected."""
-    path = DATA_DIR / "anchor.txt"
-    if path.exists():
-        return path.read_text().strip()
-    return ""
+    try:
+        with open(os.path.join(DATA_DIR, "anchor.txt")) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
 
 
-def load_stats(source: str = "startup") -> str:
-    """Rolling stats on resume or post-compaction (gap > 4h)."""
+def load_stats(source: str = "startup", gap_hours: float | None = None) -> str:
+    """Rolling stats on resume or post-compaction (gap > 4h).
+
+    `gap_hours` is the age of the newest ledger entry, probed by main()
+    before it writes this session's marker.
+    """
     # Only inject stats on resume or compact — not on fresh startup
     if source not in ("resume", "compact"):
-        age = last_score_age_hours()
-        if age is None or age < 4:
+        if gap_hours is None or gap_hours < 4:
             return ""
 
     stats = rolling_stats(days=7)
@@ -70,6 +75,9 @@ def main():
     except (json.JSONDecodeError, EOFError):
         pass
 
+    # Probe the gap before the marker below becomes the newest entry
+    gap_hours = last_score_age_hours()
+
     # Log session boundary with version
     append_session_marker(source, version=_plugin_version())
 
@@ -86,19 +94,22 @@ def main():
     if anchor:
         parts.append(anchor)
 
-    stats = load_stats(source)
+    stats = load_stats(source, gap_hours)
     if stats:
         parts.append(stats)
 
     # Environment tools: initialize registry on first run, then inject promoted tools
+    # discover (subprocess, shutil) is imported only when there is a scan to
+    # run or promoted tools to format
     try:
         import registry
-        import discover
         if not os.path.exists(registry.REGISTRY_FILE):
+            import discover
             discover.scan()
         env_tools = [t for t in registry.list_by_provenance("discovered")
                      if t.get("status") == "active" and t.get("tier") == "promoted"]
         if env_tools:
+            import discover
             env_line = discover.format_injection(env_tools)
             if env_line:
                 parts.append(env_line)
@@ -13,7 +13,7 @@ import time
 
 
 sys.path.insert(0, os.path.dirname(__file__))
-from compat import lcars_dir
+from compat import append_lines, lcars_dir
 
 
 def _tool_log_path():
@@ -72,8 +72,7 @@ def hook_main():
         "ok": not isinstance(tool_response, dict) or not tool_response.get("is_error", False),
     }
 
-    with open(_tool_log_path(), "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    append_lines(_tool_log_path(), [json.dumps(entry)])
 
     # Update registry usage counters if tool is tracked
     try:
@@ -107,8 +106,7 @@ def subagent_main():
         "agent_type": hook_input.get("agent_type", "unknown"),
     }
 
-    with open(_tool_log_path(), "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    append_lines(_tool_log_path(), [json.dumps(entry)])
 
 
 if __name__ == "__main__":
@@ -9,9 +9,9 @@ message, runs query-type-aware drift detection, stores results.
 """
 
 import json
+import os
 import re
 import sys
-from pathlib import Path
 
 # --- Scoring patterns (canonical source: lcars-eval/test/score.py) ---
 
@@ -77,6 +77,24 @@ PREAMBLE_PATTERNS = [
     r"^Thanks for",
 ]
 
+# Each pattern list fused into one regex so the response is scanned once.
+# Filler alternatives sit inside a lookahead, which tests every pattern at
+# every position: a phrase matched by two patterns (e.g. "I hope this helps")
+# still counts twice, as it did with one findall per pattern.
+# Compiled lowercased and matched against lowercased text: case-folding
+# inside the regex engine is ~3x slower. The lists above keep their canonical
+# casing; they must not use uppercase escapes (\B, \S, \W, \D), which
+# lowercasing would change.
+FILLER_RE = re.compile("(?=(" + "|".join(f"(?:{p})" for p in FILLER_PATTERNS).lower() + "))")
+
+# Tried one by one only where FILLER_RE matched, to tell which pattern a
+# match came from; compiled on demand through re's cache, since most
+# responses have no filler
+FILLER_PATTERNS_LOWER = [p.lower() for p in FILLER_PATTERNS]
+
+PREAMBLE_RE = re.compile("|".join(f"(?:{p})" for p in PREAMBLE_PATTERNS).lower())
+FIRST_LINE_RE = re.compile(r"\s*([^\n]*)")
+
 FUNCTION_WORDS = frozenset({
     "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
     "have", "has", "had", "do", "does", "did", "will", "would", "could",
@@ -88,37 +106,76 @@ FUNCTION_WORDS = frozenset({
     "no", "yes", "all", "any", "each", "every", "some", "such",
 })
 
+# Stripped from both ends of each token before the content-word check
+WORD_PUNCT = ".,!?;:\"'()[]{}#*`~>|-_/\\"
+
 
 def count_words(text: str) -> int:
-    return len([w for w in text.split() if w])
+    return len(text.split())
 
 
 def count_words_before_answer(text: str) -> int:
-    """Count preamble words before substantive content."""
-    for line in text.strip().split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        if any(re.match(p, line, re.IGNORECASE) for p in PREAMBLE_PATTERNS):
-            return count_words(line)
-        break
-    return 0
-
-
-def count_filler_phrases(text: str) -> tuple[int, list[str]]:
-    found = []
-    for pattern in FILLER_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        found.extend(matches)
+    """Count preamble words before substantive content.
+
+    Only the first non-blank line is examined, found without splitting the
+    whole response.
+    """
+    line = FIRST_LINE_RE.match(text).group(1).strip()
+    if not line:
+        return 0
+    lower = line.lower()
+    if len(lower) == len(line):
+        matched = PREAMBLE_RE.match(lower)
+    else:  # see count_filler_phrases
+        matched = re.match(PREAMBLE_RE.pattern, line, re.IGNORECASE)
+    return count_words(line) if matched else 0
+
+
+def count_filler_phrases(text: str, lower: str | None = None) -> tuple[int, list[str]]:
+    """Find filler phrases, returned with their original casing.
+
+    `lower` is text.lower(), if the caller already has it.
+    """
+    if lower is None:
+        lower = text.lower()
+    if len(lower) != len(text):
+        # Only "İ" lowercases to two characters; fall back to one
+        # case-insensitive findall per pattern rather than mapping offsets
+        found = [s for p in FILLER_PATTERNS for s in re.findall(p, text, re.IGNORECASE)]
+        return len(found), found
+    # Offsets in the lowercased copy index the original one-to-one. Matches
+    # come in text order; each is keyed by the first pattern matching at its
+    # start (the alternative FILLER_RE took) so the phrases are listed in
+    # FILLER_PATTERNS order, as one findall per pattern listed them.
+    spans = []
+    for m in FILLER_RE.finditer(lower):
+        start = m.start(1)
+        index = next(i for i, p in enumerate(FILLER_PATTERNS_LOWER)
+                     if re.compile(p).match(lower, start))
+        spans.append((index, start, m.end(1)))
+    spans.sort()
+    found = [text[start:end] for _, start, end in spans]
     return len(found), found
 
 
 def information_density(text: str) -> float:
-    words = [w.lower().strip(".,!?;:\"'()[]{}#*`~>|-_/\\") for w in text.split() if w.strip()]
+    return _density(text.lower().split())
+
+
+def _density(words: list[str]) -> float:
+    """Content-word ratio of lowercased whitespace tokens.
+
+    Tokens are only end-stripped: punctuation inside a word is significant
+    ("it's" is content, "its" is a function word).
+    """
     if not words:
         return 0.0
-    content_words = [w for w in words if w and w not in FUNCTION_WORDS and len(w) > 1]
-    return round(len(content_words) / len(words), 3)
+    content = 0
+    for w in words:
+        w = w.strip(WORD_PUNCT)
+        if len(w) > 1 and w not in FUNCTION_WORDS:
+            content += 1
+    return round(content / len(words), 3)
 
 
 def score_response(text: str) -> dict:
@@ -132,26 +189,30 @@ def score_response(text: str) -> dict:
             "info_density": 0.0,
         }
 
-    padding_count, filler_phrases = count_filler_phrases(text)
+    lower = text.lower()
+    padding_count, filler_phrases = count_filler_phrases(text, lower)
+    # One split serves both the word count and the density
+    words = lower.split()
 
     return {
-        "word_count": count_words(text),
+        "word_count": len(words),
         "answer_position": count_words_before_answer(text),
         "padding_count": padding_count,
         "filler_phrases": filler_phrases,
-        "info_density": information_density(text),
+        "info_density": _density(words),
     }
 
 
 def hook_main():
     """Stop hook entry point. Score → store → drift detect → flag."""
     # Add lib/ to path for sibling imports
-    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
     from transcript import extract_last_assistant_text
     from store import append_score, write_drift_flag, append_drift_event, rotate_store
     from drift import detect as detect_drift
     from classify import read_classification
     from fitness import evaluate_correction
+    from compat import sampled
 
     hook_input = json.load(sys.stdin)
 
@@ -186,12 +247,11 @@ def hook_main():
         write_drift_flag(drift_result)
 
     # Amortized rotation (~1% of invocations)
-    import random
-    if random.random() < 0.01:
+    if sampled(0.01):
         rotate_store()
 
     # Amortized learning pass (~5% of responses)
-    if random.random() < 0.05:
+    if sampled(0.05):
         try:
             from consolidate import run_learning_pass
             run_learning_pass()
@@ -57,7 +57,7 @@ def check_dirs() -> dict:
 
 def check_scores() -> dict:
     """Verify scores.jsonl exists with recent entries (< 24h)."""
-    from compat import lcars_dir
+    from compat import last_line, lcars_dir
     scores = os.path.join(lcars_dir(), "scores.jsonl")
     if not os.path.isfile(scores):
         return {
@@ -66,18 +66,14 @@ def check_scores() -> dict:
             "detail": "scores.jsonl not found (no scoring data yet)",
         }
     try:
-        with open(scores, "rb") as f:
-            f.seek(0, 2)
-            size = f.tell()
-            if size == 0:
-                return {
-                    "name": "scores",
-                    "status": "warn",
-                    "detail": "scores.jsonl is empty",
-                }
-            f.seek(max(size - 4096, 0))
-            lines = f.read().decode().strip().split("\n")
-        last = json.loads(lines[-1])
+        line = last_line(scores)
+        if line is None:
+            return {
+                "name": "scores",
+                "status": "warn",
+                "detail": "scores.jsonl is empty",
+            }
+        last = json.loads(line)
         age_h = (time.time() - last.get("epoch", 0)) / 3600
         if age_h > 24:
             return {
@@ -90,7 +86,7 @@ def check_scores() -> dict:
             "status": "pass",
             "detail": f"Last entry {age_h:.1f}h ago",
         }
-    except (json.JSONDecodeError, OSError, IndexError) as e:
+    except (json.JSONDecodeError, OSError) as e:
         return {
             "name": "scores",
             "status": "fail",
@@ -13,15 +13,13 @@ import json
 import os
 import time
 
-from compat import file_lock, file_unlock, lcars_memory_dir
+from compat import lcars_memory_dir, replace_file
 import registry
 
 STAGED_TOOLS_FILE = os.path.join(lcars_memory_dir(), "staged-tools.json")
 
 
 def _load_staged_file() -> list[dict]:
-    if not os.path.exists(STAGED_TOOLS_FILE):
-        return []
     try:
         with open(STAGED_TOOLS_FILE) as f:
             return json.load(f)
@@ -30,10 +28,7 @@ def _load_staged_file() -> list[dict]:
 
 
 def _save_staged_file(proposals: list[dict]):
-    with open(STAGED_TOOLS_FILE, "w") as f:
-        file_lock(f)
-        json.dump(proposals, f, indent=2)
-        file_unlock(f)
+    replace_file(STAGED_TOOLS_FILE, json.dumps(proposals, indent=2))
 
 
 def stage_proposal(proposal: dict):
@@ -11,50 +11,40 @@ import json
 import os
 import time
 from datetime import datetime
-from pathlib import Path
 
-from compat import file_lock, file_unlock, lcars_dir
+from compat import (append_lines, file_lock, file_unlock, last_line, lcars_dir, replace_file,
+                    tail_lines, trim_expired)
 
 SCORES_FILE = os.path.join(lcars_dir(), "scores.jsonl")
 DRIFT_FILE = os.path.join(lcars_dir(), "drift.json")
 DRIFT_LOG = os.path.join(lcars_dir(), "drift-events.jsonl")
 
 
-def append_score(score: dict):
-    """Append a scored response to the JSONL ledger."""
-    entry = {
+def score_entry(fields: dict) -> dict:
+    """Stamp a scores.jsonl entry with ts and epoch (fields may override them)."""
+    return {
         "ts": datetime.now().isoformat(),
         "epoch": time.time(),
-        **score,
+        **fields,
     }
-    with open(SCORES_FILE, "a") as f:
-        file_lock(f)
-        f.write(json.dumps(entry) + "\n")
-        file_unlock(f)
+
+
+def append_score(score: dict):
+    """Append a scored response to the JSONL ledger."""
+    append_lines(SCORES_FILE, [json.dumps(score_entry(score))], lock=True)
 
 
 def append_session_marker(source: str = "startup", version: str | None = None):
     """Log a session boundary marker to scores.jsonl."""
-    entry = {
-        "ts": datetime.now().isoformat(),
-        "epoch": time.time(),
-        "type": "session_start",
-        "source": source,
-    }
+    entry = score_entry({"type": "session_start", "source": source})
     if version:
         entry["version"] = version
-    with open(SCORES_FILE, "a") as f:
-        file_lock(f)
-        f.write(json.dumps(entry) + "\n")
-        file_unlock(f)
+    append_lines(SCORES_FILE, [json.dumps(entry)], lock=True)
 
 
 def write_drift_flag(details: dict):
     """Write drift flag for SessionStart hook to pick up."""
-    with open(DRIFT_FILE, "w") as f:
-        file_lock(f)
-        json.dump(details, f)
-        file_unlock(f)
+    replace_file(DRIFT_FILE, json.dumps(details))
 
 
 def append_drift_event(details: dict):
@@ -64,10 +54,7 @@ def append_drift_event(details: dict):
         "epoch": time.time(),
         **{k: v for k, v in details.items() if k not in ("ts", "epoch")},
     }
-    with open(DRIFT_LOG, "a") as f:
-        file_lock(f)
-        f.write(json.dumps(entry) + "\n")
-        file_unlock(f)
+    append_lines(DRIFT_LOG, [json.dumps(entry)])
 
 
 def read_and_clear_drift_flag() -> dict | None:
@@ -91,54 +78,46 @@ def read_and_clear_drift_flag() -> dict | None:
 
 def last_score_age_hours() -> float | None:
     """Hours since last score entry. None if no scores exist."""
-    if not os.path.exists(SCORES_FILE):
-        return None
     try:
-        with open(SCORES_FILE, "rb") as f:
-            f.seek(0, 2)
-            if f.tell() == 0:
-                return None
-            f.seek(max(f.tell() - 4096, 0))
-            lines = f.read().decode().strip().split("\n")
-        last = json.loads(lines[-1])
+        line = last_line(SCORES_FILE)
+        if line is None:
+            return None
+        last = json.loads(line)
         elapsed = time.time() - last.get("epoch", 0)
         return elapsed / 3600
-    except (json.JSONDecodeError, OSError, IndexError):
+    except (json.JSONDecodeError, OSError):
         return None
 
 
 def rolling_stats(days: int = 7) -> dict | None:
-    """Compute rolling stats over recent scores."""
-    if not os.path.exists(SCORES_FILE):
-        return None
+    """Compute rolling stats over recent scores.
 
+    Reads only the window from the tail of the ledger, so cost tracks
+    recent activity rather than the ledger's age, and sums each entry as
+    it is parsed instead of keeping the parsed window around.
+    """
     cutoff = time.time() - (days * 86400)
-    scores = []
+    n = drift_count = 0
+    total_density = total_words = 0
 
     try:
-        with open(SCORES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("type") == "session_start":
-                    continue
-                if entry.get("epoch", 0) >= cutoff:
-                    scores.append(entry)
+        for line in tail_lines(SCORES_FILE, cutoff):
+            s = json.loads(line)
+            if s.get("type") == "session_start":
+                continue
+            n += 1
+            if s.get("padding_count", 0) > 0 or s.get("answer_position", 0) > 0:
+                drift_count += 1
+            total_density += s.get("info_density", 0)
+            total_words += s.get("word_count", 0)
     except (json.JSONDecodeError, OSError):
         return None
 
-    if not scores:
+    if not n:
         return None
 
-    n = len(scores)
-    drift_count = sum(
-        1 for s in scores
-        if s.get("padding_count", 0) > 0 or s.get("answer_position", 0) > 0
-    )
-    avg_density = sum(s.get("info_density", 0) for s in scores) / n
-    avg_words = sum(s.get("word_count", 0) for s in scores) / n
+    avg_density = total_density / n
+    avg_words = total_words / n
 
     return {
         "responses": n,
@@ -150,25 +129,8 @@ def rolling_stats(days: int = 7) -> dict | None:
 
 def rotate_store(keep_weeks: int = 4):
     """Remove scores older than keep_weeks."""
-    if not os.path.exists(SCORES_FILE):
-        return
-
     cutoff = time.time() - (keep_weeks * 7 * 86400)
-    kept = []
-
     try:
-        with open(SCORES_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                entry = json.loads(line)
-                if entry.get("epoch", 0) >= cutoff:
-                    kept.append(line)
-    except (json.JSONDecodeError, OSError):
+        trim_expired(SCORES_FILE, cutoff)
+    except OSError:
         return
-
-    with open(SCORES_FILE, "w") as f:
-        file_lock(f)
-        f.write("\n".join(kept) + "\n" if kept else "")
-        file_unlock(f)
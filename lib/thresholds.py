@@ -6,50 +6,90 @@ Falls back to data/thresholds.json (shipped defaults) on first run.
 
 import json
 import os
-import shutil
 import sys
-from pathlib import Path
+
+_LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_ROOT = os.path.dirname(_LIB_DIR)
+
+sys.path.insert(0, _LIB_DIR)
+from compat import lcars_dir, replace_file
 
 
 def _plugin_root():
-    """Resolve plugin root from env or relative to this file."""
-    return Path(os.environ.get("CLAUDE_PLUGIN_ROOT", Path(__file__).parent.parent))
+    """Resolve plugin root from env or relative to this file.
+
+    The env var is read per call (tests and skills may set it late); the
+    file-relative fallback is resolved once at import.
+    """
+    return os.environ.get("CLAUDE_PLUGIN_ROOT", _DEFAULT_ROOT)
 
 
 def _runtime_path():
-    sys.path.insert(0, str(Path(__file__).parent))
-    from compat import lcars_dir
     return os.path.join(lcars_dir(), "thresholds.json")
 
 
 def _default_path():
-    return _plugin_root() / "data" / "thresholds.json"
+    return os.path.join(_plugin_root(), "data", "thresholds.json")
 
 
 def _ensure_runtime():
-    """Copy default thresholds to runtime location on first run."""
+    """Copy default thresholds to runtime location on first run.
+
+    The runtime file is what /calibrate edits and /dashboard reads, so it is
+    materialized rather than served from the defaults. Copied by hand:
+    shutil costs ~3ms to import in every hook that loads this module, for
+    a copy that happens once per install.
+    """
     runtime = _runtime_path()
-    if not os.path.exists(runtime):
-        default = _default_path()
-        if default.exists():
-            os.makedirs(os.path.dirname(runtime), exist_ok=True)
-            shutil.copy2(str(default), runtime)
+    if os.path.exists(runtime):
+        return
+    try:
+        with open(_default_path()) as f:
+            defaults = f.read()
+    except OSError:
+        return
+    os.makedirs(os.path.dirname(runtime), exist_ok=True)
+    replace_file(runtime, defaults)
+
+
+# path -> ((mtime_ns, size), thresholds); reloaded only when the file changes
+_thresholds_cache = {}
 
 
 def load() -> dict:
-    """Load current thresholds. Returns the full thresholds dict."""
-    _ensure_runtime()
+    """Load current thresholds. Returns the full thresholds dict.
+
+    Cached per path and keyed on the runtime file's mtime and size, so
+    /calibrate's edits are picked up without re-parsing on every call.
+    """
     runtime = _runtime_path()
+    try:
+        st = os.stat(runtime)
+    except OSError:
+        _ensure_runtime()
+        try:
+            st = os.stat(runtime)
+        except OSError:
+            return _load_default()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _thresholds_cache.get(runtime)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     try:
         with open(runtime) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return _load_default()
+    _thresholds_cache[runtime] = (stamp, data)
+    return data
+
+
+def _load_default() -> dict:
+    try:
+        with open(_default_path()) as f:
             return json.load(f)
     except (OSError, json.JSONDecodeError):
-        # Fall back to defaults
-        try:
-            with open(_default_path()) as f:
-                return json.load(f)
-        except (OSError, json.JSONDecodeError):
-            return {"global": {"filler": 0, "preamble": 0, "density": 0.60}}
+        return {"global": {"filler": 0, "preamble": 0, "density": 0.60}}
 
 
 def get(metric: str, query_type: str = "ambiguous") -> int | float:
@@ -59,8 +99,17 @@ def get(metric: str, query_type: str = "ambiguous") -> int | float:
         metric: 'filler', 'preamble', or 'density'
         query_type: query classification from classify.py
     """
+    return _lookup(load(), metric, query_type)
+
+
+def get_all(query_type: str = "ambiguous") -> dict:
+    """Get the filler, preamble and density thresholds from a single load."""
     data = load()
+    return {metric: _lookup(data, metric, query_type)
+            for metric in ("filler", "preamble", "density")}
+
 
+def _lookup(data: dict, metric: str, query_type: str) -> int | float:
     # Check query-type-specific override first
     override = data.get("by_query_type", {}).get(query_type, {}).get(metric)
     if override is not None:
@@ -76,3 +125,4 @@ def save(data: dict):
     os.makedirs(os.path.dirname(runtime), exist_ok=True)
     with open(runtime, "w") as f:
         json.dump(data, f, indent=2)
+    _thresholds_cache.pop(runtime, None)
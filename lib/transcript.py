@@ -5,72 +5,119 @@ Used by score.py (Stop hook) and consolidate.py (PreCompact hook).
 """
 
 import json
-from pathlib import Path
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from compat import json_loads, reverse_lines
+
+
+def _is_array(f) -> bool:
+    """True if the open transcript is a JSON array rather than JSONL."""
+    head = f.read(64).lstrip()
+    f.seek(0)
+    return head.startswith(b"[")
+
+
+def _iter_transcript(path: str, mentions: tuple[bytes, ...] = ()):
+    """Yield transcript entries from JSONL or JSON array format.
+
+    JSONL is parsed a line at a time, so memory is bounded by the longest
+    line rather than the transcript. Lines are parsed as raw bytes with
+    json_loads (orjson when installed) rather than decoded first. If
+    `mentions` is given, JSONL lines containing none of those substrings
+    are skipped unparsed; callers still check each entry's type.
+    """
+    wanted = re.compile(b"|".join(map(re.escape, mentions))).search if mentions else None
+    with open(path, "rb") as f:
+        if _is_array(f):
+            try:
+                data = json_loads(f.read())
+            except json.JSONDecodeError:
+                data = None
+            if isinstance(data, list):
+                yield from data
+                return
+            f.seek(0)
+
+        # JSONL, or an array that failed to parse
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if wanted and not wanted(line):
+                continue
+            try:
+                yield json_loads(line)
+            except json.JSONDecodeError:
+                continue
 
 
-def _read_transcript(path: Path) -> list[dict]:
-    """Read transcript entries from JSONL or JSON array format."""
-    text = path.read_text().strip()
-    if not text:
-        return []
+def _last_text(entry: dict) -> str | None:
+    """Return the last text block of an assistant entry, or None."""
+    if entry.get("type") != "assistant":
+        return None
+    last_text = None
+    for block in entry.get("message", {}).get("content", []):
+        if block.get("type") == "text":
+            last_text = block["text"]
+    return last_text
 
-    # Try JSON array first (starts with '[')
-    if text.startswith("["):
-        try:
-            data = json.loads(text)
-            if isinstance(data, list):
-                return data
-        except json.JSONDecodeError:
-            pass
 
-    # Fall back to JSONL
-    entries = []
-    for line in text.split("\n"):
-        line = line.strip()
-        if not line:
+def _reverse_entries(path: str):
+    """Yield assistant JSONL entries from the end of the transcript backward."""
+    # Stdlib json on purpose: the Stop hook parses only the last few entries
+    # here, and nothing else on its path imports orjson, which would cost
+    # ~7ms per response. The forward passes over a whole transcript
+    # (PreCompact) use json_loads.
+    for line in reverse_lines(path):
+        if b'"assistant"' not in line:
             continue
         try:
-            entries.append(json.loads(line))
+            yield json.loads(line)
         except json.JSONDecodeError:
             continue
-    return entries
 
 
 def extract_last_assistant_text(transcript_path: str) -> str | None:
-    """Extract the last assistant text block from a JSONL transcript."""
-    path = Path(transcript_path)
-    if not path.exists():
+    """Extract the last assistant text block from a JSONL transcript.
+
+    Walks the transcript from the end and stops at the newest assistant
+    message with text, so cost is bounded by the tail, not the session.
+    """
+    if not os.path.exists(transcript_path):
         return None
 
-    last_text = None
     try:
-        entries = _read_transcript(path)
+        with open(transcript_path, "rb") as f:
+            is_array = _is_array(f)
+        entries = (reversed(list(_iter_transcript(transcript_path))) if is_array
+                   else _reverse_entries(transcript_path))
         for entry in entries:
-            if entry.get("type") != "assistant":
-                continue
-            content = entry.get("message", {}).get("content", [])
-            for block in content:
-                if block.get("type") == "text":
-                    last_text = block["text"]
+            text = _last_text(entry)
+            if text is not None:
+                return text
     except OSError:
         return None
 
-    return last_text
+    return None
 
 
 def count_assistant_messages(transcript_path: str) -> int:
     """Count total assistant text messages in a transcript."""
-    path = Path(transcript_path)
-    if not path.exists():
+    if not os.path.exists(transcript_path):
         return 0
 
     count = 0
     try:
-        for entry in _read_transcript(path):
-            if entry.get("type") == "assistant":
-                content = entry.get("message", {}).get("content", [])
-                if any(b.get("type") == "text" for b in content):
+        for entry in _iter_transcript(transcript_path, (b'"assistant"',)):
+            if entry.get("type") != "assistant":
+                continue
+            for block in entry.get("message", {}).get("content", []):
+                if block.get("type") == "text":
                     count += 1
+                    break
     except OSError:
         pass
 
@@ -79,29 +126,31 @@ def count_assistant_messages(transcript_path: str) -> int:
 
 def extract_tool_calls(transcript_path: str) -> list[dict]:
     """Extract all tool calls from a transcript. Returns list of {name, success}."""
-    path = Path(transcript_path)
-    if not path.exists():
+    if not os.path.exists(transcript_path):
         return []
 
     calls = []
+    # tool_use id -> calls still awaiting a result, newest last. Ids can
+    # repeat (or be missing, keyed ""), and a result goes to the most
+    # recent unmatched call with its id.
+    pending = {}
     try:
-        for entry in _read_transcript(path):
+        for entry in _iter_transcript(transcript_path, (b'"assistant"', b'"tool_result"')):
             if entry.get("type") == "assistant":
                 content = entry.get("message", {}).get("content", [])
                 for block in content:
                     if block.get("type") == "tool_use":
-                        calls.append({
+                        call = {
                             "name": block.get("name", "unknown"),
                             "id": block.get("id", ""),
-                        })
+                        }
+                        calls.append(call)
+                        pending.setdefault(call["id"], []).append(call)
 
             if entry.get("type") == "tool_result":
-                tool_id = entry.get("tool_use_id", "")
-                is_error = entry.get("is_error", False)
-                for call in reversed(calls):
-                    if call.get("id") == tool_id and "success" not in call:
-                        call["success"] = not is_error
-                        break
+                waiting = pending.get(entry.get("tool_use_id", ""))
+                if waiting:
+                    waiting.pop()["success"] = not entry.get("is_error", False)
     except OSError:
         pass
 
@@ -7,7 +7,6 @@ Adds lib/ to sys.path so imports work as they do in hook mode.
 import json
 import os
 import sys
-import time
 
 import pytest
 
@@ -15,6 +14,12 @@ import pytest
 LIB_DIR = os.path.join(os.path.dirname(__file__), "..", "lib")
 sys.path.insert(0, LIB_DIR)
 
+import compat
+import consolidate
+import fitness
+import store
+from compat import append_lines
+
 # Plugin root for data/ files (anchor.txt, corrections.json, thresholds.json)
 PLUGIN_ROOT = os.path.join(os.path.dirname(__file__), "..")
 
@@ -25,6 +30,26 @@ def plugin_root_env(monkeypatch):
     monkeypatch.setenv("CLAUDE_PLUGIN_ROOT", PLUGIN_ROOT)
 
 
+# (module.attribute, directory, file name) for every runtime path a module
+# resolves at import time; lcars_tmpdir points each one into tmp_path.
+_RUNTIME_PATHS = [
+    ("store.SCORES_FILE", "lcars", "scores.jsonl"),
+    ("store.DRIFT_FILE", "lcars", "drift.json"),
+    ("store.DRIFT_LOG", "lcars", "drift-events.jsonl"),
+    ("fitness.PENDING_FILE", "lcars", "pending-correction.json"),
+    ("fitness.OUTCOMES_FILE", "memory", "correction-outcomes.jsonl"),
+    ("consolidate.SUMMARIES_FILE", "memory", "session-summaries.jsonl"),
+    ("consolidate.PATTERNS_FILE", "memory", "patterns.json"),
+    ("consolidate.SCORES_FILE", "lcars", "scores.jsonl"),
+    ("foundry.STAGED_FILE", "memory", "staged-strategies.json"),
+    ("foundry.OUTCOMES_FILE", "memory", "correction-outcomes.jsonl"),
+    ("foundry.PATTERNS_FILE", "memory", "patterns.json"),
+    ("registry.REGISTRY_FILE", "memory", "tool-registry.json"),
+    ("discover.ENV_SCAN_FILE", "memory", "env-scan.json"),
+    ("staging.STAGED_TOOLS_FILE", "memory", "staged-tools.json"),
+]
+
+
 @pytest.fixture
 def lcars_tmpdir(tmp_path, monkeypatch):
     """Create a temporary LCARS runtime directory and patch compat paths."""
@@ -34,38 +59,13 @@ def lcars_tmpdir(tmp_path, monkeypatch):
     memory_dir.mkdir()
 
     # Patch compat.lcars_dir and lcars_memory_dir to use tmp
-    import compat
     monkeypatch.setattr(compat, "lcars_dir", lambda: str(lcars_dir))
     monkeypatch.setattr(compat, "lcars_memory_dir", lambda: str(memory_dir))
 
     # Patch module-level path constants that were computed at import time
-    import store
-    monkeypatch.setattr(store, "SCORES_FILE", str(lcars_dir / "scores.jsonl"))
-    monkeypatch.setattr(store, "DRIFT_FILE", str(lcars_dir / "drift.json"))
-    monkeypatch.setattr(store, "DRIFT_LOG", str(lcars_dir / "drift-events.jsonl"))
-
-    import fitness
-    monkeypatch.setattr(fitness, "PENDING_FILE", str(lcars_dir / "pending-correction.json"))
-    monkeypatch.setattr(fitness, "OUTCOMES_FILE", str(memory_dir / "correction-outcomes.jsonl"))
-
-    import consolidate
-    monkeypatch.setattr(consolidate, "SUMMARIES_FILE", str(memory_dir / "session-summaries.jsonl"))
-    monkeypatch.setattr(consolidate, "PATTERNS_FILE", str(memory_dir / "patterns.json"))
-    monkeypatch.setattr(consolidate, "SCORES_FILE", str(lcars_dir / "scores.jsonl"))
-
-    import foundry
-    monkeypatch.setattr(foundry, "STAGED_FILE", str(memory_dir / "staged-strategies.json"))
-    monkeypatch.setattr(foundry, "OUTCOMES_FILE", str(memory_dir / "correction-outcomes.jsonl"))
-    monkeypatch.setattr(foundry, "PATTERNS_FILE", str(memory_dir / "patterns.json"))
-
-    import registry
-    monkeypatch.setattr(registry, "REGISTRY_FILE", str(memory_dir / "tool-registry.json"))
-
-    import discover
-    monkeypatch.setattr(discover, "ENV_SCAN_FILE", str(memory_dir / "env-scan.json"))
-
-    import staging
-    monkeypatch.setattr(staging, "STAGED_TOOLS_FILE", str(memory_dir / "staged-tools.json"))
+    dirs = {"lcars": lcars_dir, "memory": memory_dir}
+    for target, where, name in _RUNTIME_PATHS:
+        monkeypatch.setattr(target, str(dirs[where] / name))
 
     return lcars_dir
 
@@ -96,13 +96,14 @@ def sample_score_sycophantic():
 
 @pytest.fixture
 def write_scores(lcars_tmpdir):
-    """Helper to write score entries to the JSONL ledger."""
-    import store
+    """Helper to write score entries to the JSONL ledger.
+
+    Entries take the shape append_score gives them, written in one append.
+    """
 
     def _write(scores: list[dict]):
-        for s in scores:
-            entry = {"epoch": s.get("epoch", time.time()), **s}
-            store.append_score(entry)
+        append_lines(store.SCORES_FILE, [json.dumps(store.score_entry(s)) for s in scores],
+                     lock=True)
 
     return _write
 
@@ -110,11 +111,9 @@ def write_scores(lcars_tmpdir):
 @pytest.fixture
 def write_summaries(lcars_tmpdir):
     """Helper to write session summaries."""
-    import consolidate
 
     def _write(summaries: list[dict]):
-        for s in summaries:
-            consolidate.append_summary(s)
+        append_lines(consolidate.SUMMARIES_FILE, [json.dumps(s) for s in summaries])
 
     return _write
 
@@ -123,10 +122,6 @@ def write_summaries(lcars_tmpdir):
 def write_outcomes(lcars_tmpdir):
     """Helper to write correction outcomes."""
     def _write(outcomes: list[dict]):
-        import fitness
-        path = fitness.OUTCOMES_FILE
-        with open(path, "a") as f:
-            for o in outcomes:
-                f.write(json.dumps(o) + "\n")
+        append_lines(fitness.OUTCOMES_FILE, [json.dumps(o) for o in outcomes])
 
     return _write
@@ -18,6 +18,9 @@ class TestQueryTypes:
         # Use a more code-specific context
         assert classify("Getting TypeError in my pytest test suite") == "code"
 
+    def test_code_error_name_case_insensitive(self):
+        assert classify("KEYERROR raised from my pip install") == "code"
+
     def test_diagnostic_query(self):
         assert classify("Why isn't my server starting?") == "diagnostic"
 
@@ -121,6 +124,10 @@ class TestQueryTypes:
     def test_directive_open(self):
         assert classify("open the config file") == "directive"
 
+    def test_more_matches_beat_earlier_category(self):
+        """diagnostic and directive match once each; factual matches twice and wins."""
+        assert classify("can you check the logs and tell me how many errors") == "factual"
+
 
 class TestCorrectionInjection:
     def test_no_drift_no_correction(self, lcars_tmpdir):
@@ -183,6 +190,23 @@ class TestCorrectionInjection:
         assert read_classification() == "code"
 
 
+class TestPatternTable:
+    def test_patterns_are_lowercase(self):
+        """Patterns run without re.IGNORECASE against the lowercased prompt."""
+        import re
+        from classify import LITERALS, PATTERNS
+        for patterns in PATTERNS.values():
+            for p in patterns:
+                unescaped = re.sub(r"\\.", "", p)
+                assert unescaped == unescaped.lower(), p
+        for literal_sets in LITERALS.values():
+            for literals in literal_sets:
+                assert all(lit == lit.lower() for lit in literals)
+
+    def test_uppercase_prompt(self):
+        assert classify("I'M FRUSTRATED AND STUCK") == "emotional"
+
+
 class TestEdgeCases:
     def test_empty_string(self):
         assert classify("") == "ambiguous"
@@ -190,6 +214,13 @@ class TestEdgeCases:
     def test_whitespace(self):
         assert classify("   ") == "ambiguous"
 
+    def test_long_whitespace_run_is_linear(self):
+        """A pasted prompt with a huge whitespace run must not backtrack past the hook timeout."""
+        import time
+        start = time.perf_counter()
+        assert classify("thoughts" + " " * 50_000 + "x") == "ambiguous"
+        assert time.perf_counter() - start < 2.0
+
     def test_none_like(self):
         # classify expects a string; empty should be safe
         assert classify("") == "ambiguous"
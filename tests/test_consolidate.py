@@ -46,6 +46,33 @@ class TestOverfitGates:
         assert result["patterns_validated"] >= 1
         assert "filler" in result["patterns_added"]
 
+    def test_validated_pattern_fields(self, lcars_tmpdir, write_summaries):
+        """Session count, unique days and first/last seen reduce per drift type."""
+        dates = ["2026-02-16", "2026-02-15", "2026-02-16", "2026-02-18", "2026-02-15", "2026-02-17"]
+        write_summaries([
+            {
+                "epoch": time.time() - i * 3600,
+                "date": date,
+                "responses": 5,
+                "avg_density": 0.55,
+                "drift_types": ["filler", "preamble"] if i % 2 else ["filler"],
+                "query_types": {"factual": 5},
+            }
+            for i, date in enumerate(dates)
+        ])
+
+        consolidate.consolidate()
+        patterns = {p["drift_type"]: p for p in consolidate._load_patterns()}
+        assert patterns["filler"] == {
+            "drift_type": "filler",
+            "sessions": 6,
+            "unique_days": 4,
+            "first_seen": "2026-02-15",
+            "last_seen": "2026-02-18",
+            "status": "validated",
+        }
+        assert "preamble" not in patterns  # 3 sessions < MIN_SESSIONS
+
     def test_same_day_insufficient(self, lcars_tmpdir, write_summaries):
         """5 sessions all on same day -> not enough calendar day spread."""
         summaries = [
@@ -131,6 +158,60 @@ class TestSessionSummaryExtraction:
         assert "filler" in summary["drift_types"]
 
 
+class TestRecentLines:
+    def test_old_lines_skipped_without_parsing(self, lcars_tmpdir):
+        """Lines older than the cutoff are never parsed — a corrupt one is harmless."""
+        now = time.time()
+        with open(consolidate.SUMMARIES_FILE, "w") as f:
+            f.write('{"epoch": %f, "date": "2026-01-01", "drift_types": [\n' % (now - 90 * 86400))
+            f.write(json.dumps({"epoch": now - 60, "date": "2026-02-18", "responses": 3}) + "\n")
+
+        loaded = consolidate.load_summaries()
+        assert [s["responses"] for s in loaded] == [3]
+
+    def test_epoch_not_first_key(self, lcars_tmpdir, write_scores):
+        """Score lines lead with "ts"; the epoch gate still finds the key."""
+        write_scores([{"epoch": time.time() - 30, "padding_count": 0, "info_density": 0.7}])
+        with open(consolidate.SCORES_FILE) as f:
+            assert f.read().startswith('{"ts"')
+
+        summary = consolidate.extract_session_summary(consolidate.SCORES_FILE)
+        assert summary["responses"] == 1
+
+    def test_tail_window_ignores_ledger_head(self, lcars_tmpdir):
+        """The 2h window is read from the tail; older history is never touched."""
+        now = time.time()
+        with open(consolidate.SCORES_FILE, "w") as f:
+            f.write("not json at all\n")
+            for i in range(50):
+                f.write(json.dumps({"epoch": now - 86400 + i, "padding_count": 1}) + "\n")
+            for i in range(3):
+                f.write(json.dumps({"epoch": now - 300 + i, "padding_count": 0,
+                                    "info_density": 0.7, "query_type": "code"}) + "\n")
+
+        summary = consolidate.extract_session_summary(consolidate.SCORES_FILE)
+        assert summary["responses"] == 3
+        assert summary["drift_types"] == []
+        assert summary["query_types"] == {"code": 3}
+
+    def test_tail_window_empty_file(self, lcars_tmpdir):
+        open(consolidate.SCORES_FILE, "w").close()
+        assert consolidate.extract_session_summary(consolidate.SCORES_FILE) is None
+
+    def test_rotate_keeps_recent_lines_verbatim(self, lcars_tmpdir, write_summaries):
+        now = time.time()
+        write_summaries([
+            {"epoch": now - 60 * 86400, "date": "2026-01-01"},
+            {"epoch": now - 60, "date": "2026-02-18"},
+        ])
+        consolidate.rotate_summaries()
+
+        with open(consolidate.SUMMARIES_FILE) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["date"] == "2026-02-18"
+
+
 class TestSummarizePreviousSession:
     def test_no_segments(self, lcars_tmpdir):
         """Empty scores.jsonl -> None."""
@@ -211,6 +292,23 @@ class TestSummarizePreviousSession:
         result = consolidate.summarize_previous_session()
         assert result is None
 
+    def test_reads_only_last_session(self, lcars_tmpdir):
+        """A corrupt line in an older session doesn't block the tail read."""
+        now = time.time()
+        with open(consolidate.SCORES_FILE, "a") as f:
+            f.write("not json{{{\n")
+            for e in [
+                {"type": "session_start", "epoch": now - 3000, "source": "startup"},
+                {"epoch": now - 2900, "padding_count": 0, "info_density": 0.6, "query_type": "code"},
+                {"type": "session_start", "epoch": now - 1000, "source": "startup"},
+            ]:
+                f.write(json.dumps(e) + "\n")
+
+        result = consolidate.summarize_previous_session()
+        assert result is not None
+        assert result["responses"] == 1
+        assert result["query_types"] == {"code": 1}
+
 
 class TestRunLearningPass:
     def _make_session_entries(self, epoch, n_scores=3):
@@ -434,6 +532,28 @@ class TestSegmentBasedConsolidation:
         assert result["status"] == "consolidated"
         assert "filler" in result["patterns_added"]
 
+    def test_summary_cache_single_pass(self, lcars_tmpdir, write_summaries):
+        """One read yields both the cached marker epochs and the fallback summaries."""
+        now = time.time()
+        write_summaries([
+            {"epoch": now - 60 * 86400, "date": "2026-01-01", "_marker_epoch": 100.0},
+            {"epoch": now - 60, "date": "2026-02-18", "_marker_epoch": 200.0},
+            {"epoch": now - 30, "date": "2026-02-18"},
+        ])
+
+        epochs, summaries = consolidate._load_summary_cache()
+        assert epochs == consolidate._load_cached_epochs() == {100.0, 200.0}
+        assert summaries == consolidate.load_summaries()
+        assert len(summaries) == 2
+
+        # A corrupt line outside the window is skipped, as load_summaries skips it
+        with open(consolidate.SUMMARIES_FILE, "a") as f:
+            f.write('{"epoch": %f, "date": "2025-11-20", "drift_types": [\n' % (now - 90 * 86400))
+        epochs, summaries = consolidate._load_summary_cache()
+        assert epochs == {100.0, 200.0}
+        assert summaries == consolidate.load_summaries()
+        assert len(summaries) == 2
+
     def test_insufficient_sessions_from_markers(self, lcars_tmpdir):
         """Fewer than 5 sessions from markers -> insufficient_data."""
         now = time.time()
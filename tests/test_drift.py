@@ -140,6 +140,25 @@ class TestNewQueryTypeThresholds:
         assert result["severity"] == "high"
         assert result["correction"] != ""
 
+    def test_defaults_copied_on_first_load(self, tmp_path, monkeypatch):
+        import thresholds
+        runtime = tmp_path / "thresholds.json"
+        monkeypatch.setattr(thresholds, "_runtime_path", lambda: str(runtime))
+        data = thresholds.load()
+        assert runtime.read_text() == open(thresholds._default_path()).read()
+        assert data["global"]["density"] == 0.60
+
+    def test_thresholds_reloaded_after_save(self, tmp_path, monkeypatch):
+        """Cached thresholds are dropped when /calibrate saves new ones."""
+        import thresholds
+        monkeypatch.setattr(thresholds, "_runtime_path", lambda: str(tmp_path / "thresholds.json"))
+        score = {"padding_count": 0, "answer_position": 0, "info_density": 0.55}
+        assert detect(score, "factual") is not None
+
+        data = thresholds.load()
+        thresholds.save({**data, "by_query_type": {"factual": {"density": 0.50}}})
+        assert detect(score, "factual") is None
+
 
 class TestCorrectionSelection:
     def test_filler_high_returns_template_with_placeholder(self):
@@ -160,3 +179,39 @@ class TestCorrectionSelection:
         correction = _select_correction("compound", "high", "*", score, reasons)
         assert "filler:3" in correction
         assert "preamble:8w" in correction
+
+    def test_corrections_reloaded_when_file_changes(self, tmp_path, monkeypatch):
+        """Cached decision table is re-read after the file is rewritten."""
+        import json
+        (tmp_path / "data").mkdir()
+        path = tmp_path / "data" / "corrections.json"
+        monkeypatch.setenv("CLAUDE_PLUGIN_ROOT", str(tmp_path))
+        score = {"padding_count": 1, "answer_position": 0, "info_density": 0.70}
+
+        path.write_text(json.dumps({"strategies": [
+            {"drift": "filler", "severity": "*", "query": "*", "template": "first"},
+        ]}))
+        assert _select_correction("filler", "low", "*", score, []) == "first"
+
+        path.write_text(json.dumps({"strategies": [
+            {"drift": "filler", "severity": "*", "query": "*", "template": "second one"},
+        ]}))
+        assert _select_correction("filler", "low", "*", score, []) == "second one"
+
+    def test_specificity_order(self, tmp_path, monkeypatch):
+        """severity+query > severity+* > *+query > *+*, first duplicate wins."""
+        import json
+        (tmp_path / "data").mkdir()
+        monkeypatch.setenv("CLAUDE_PLUGIN_ROOT", str(tmp_path))
+        (tmp_path / "data" / "corrections.json").write_text(json.dumps({"strategies": [
+            {"drift": "filler", "severity": "*", "query": "*", "template": "any"},
+            {"drift": "filler", "severity": "*", "query": "code", "template": "query"},
+            {"drift": "filler", "severity": "high", "query": "*", "template": "sev"},
+            {"drift": "filler", "severity": "high", "query": "*", "template": "dup"},
+            {"drift": "filler", "severity": "high", "query": "code", "template": "both"},
+        ]}))
+        score = {"padding_count": 1, "answer_position": 0, "info_density": 0.70}
+        assert _select_correction("filler", "high", "code", score, []) == "both"
+        assert _select_correction("filler", "high", "factual", score, []) == "sev"
+        assert _select_correction("filler", "low", "code", score, []) == "query"
+        assert _select_correction("filler", "low", "factual", score, []) == "any"
@@ -7,6 +7,16 @@ import fitness
 
 
 class TestRecordAndEvaluate:
+    def test_record_replaces_pending_file(self, lcars_tmpdir):
+        """Recording writes the pending file whole and leaves no temp file."""
+        import os
+        fitness.record_correction({"categories": ["filler"], "severity": "low"})
+        fitness.record_correction({"categories": ["density"], "severity": "high"})
+
+        with open(fitness.PENDING_FILE) as f:
+            assert json.load(f)["categories"] == ["density"]
+        assert not [n for n in os.listdir(os.path.dirname(fitness.PENDING_FILE)) if ".tmp." in n]
+
     def test_effective_correction(self, lcars_tmpdir):
         """Correction that improves filler count → effective."""
         drift_details = {
@@ -82,6 +92,19 @@ class TestRecordAndEvaluate:
         outcome = fitness.evaluate_correction(post_score)
         assert outcome is None
 
+    def test_pending_consumed_once(self, lcars_tmpdir):
+        """A pending correction is evaluated once; corrupt ones are discarded."""
+        import os
+        post_score = {"padding_count": 0, "answer_position": 0, "info_density": 0.70}
+        fitness.record_correction({"categories": ["filler"], "padding_count": 2})
+        assert fitness.evaluate_correction(post_score) is not None
+        assert fitness.evaluate_correction(post_score) is None
+
+        with open(fitness.PENDING_FILE, "w") as f:
+            f.write("{not json")
+        assert fitness.evaluate_correction(post_score) is None
+        assert os.listdir(os.path.dirname(fitness.PENDING_FILE)) == ["memory"]
+
 
 class TestFitnessRate:
     def test_rate_calculation(self, lcars_tmpdir, write_outcomes):
@@ -101,3 +124,15 @@ class TestFitnessRate:
     def test_no_outcomes_returns_none(self, lcars_tmpdir):
         rate = fitness.fitness_rate()
         assert rate is None
+
+    def test_reads_only_recent_window(self, lcars_tmpdir, write_outcomes):
+        """Outcomes older than the window, even corrupt ones, are not parsed."""
+        with open(fitness.OUTCOMES_FILE, "w") as f:
+            f.write("not json{{{\n")
+        write_outcomes([
+            {"epoch": time.time() - 40 * 86400, "categories": ["filler"], "effective": True},
+            {"epoch": time.time(), "categories": ["filler"], "effective": False},
+        ])
+
+        rate = fitness.fitness_rate(days=30)
+        assert rate == {"total": 1, "effective": 0, "rate": 0.0}
@@ -34,6 +34,26 @@ class TestGapProposals:
         assert gap_proposals[0]["query"] == "emotional"
 
 
+class TestAggregateOutcomes:
+    def test_counts_per_drift_query_and_drift(self):
+        outcomes = [
+            {"categories": ["filler", "density"], "query_type": "code", "effective": True},
+            {"categories": ["filler"], "query_type": "factual", "effective": False},
+            {"categories": ["filler"], "effective": False},
+        ]
+        by_drift_query, by_drift = foundry._aggregate_outcomes(outcomes)
+        assert by_drift_query == {
+            ("filler", "code"): {"total": 1, "effective": 1},
+            ("density", "code"): {"total": 1, "effective": 1},
+            ("filler", "factual"): {"total": 1, "effective": 0},
+            ("filler", "ambiguous"): {"total": 1, "effective": 0},
+        }
+        assert by_drift == {
+            "filler": {"total": 3, "effective": 1},
+            "density": {"total": 1, "effective": 1},
+        }
+
+
 class TestSuppressionProposals:
     def test_suppression_detected(self, lcars_tmpdir, write_outcomes):
         """Strategy fires >30% of the time, effective <50% → suppression."""
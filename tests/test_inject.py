@@ -40,6 +40,35 @@ class TestContextAssembly:
         stats = inject.load_stats("startup")
         assert stats == ""
 
+    def test_startup_stats_only_after_gap(self, lcars_tmpdir, write_scores):
+        """Startup injects stats only when the newest entry is over 4h old."""
+        import time
+        write_scores([{
+            "epoch": time.time() - 5 * 3600,
+            "word_count": 50,
+            "answer_position": 0,
+            "padding_count": 0,
+            "info_density": 0.65,
+        }])
+        assert inject.load_stats("startup", gap_hours=1.0) == ""
+        assert inject.load_stats("startup", gap_hours=5.0) != ""
+        assert inject.load_stats("compact") != ""
+
+    def test_main_probes_gap_before_marker(self, lcars_tmpdir, write_scores, monkeypatch, capsys):
+        """main() reads the gap before its own marker makes the ledger fresh."""
+        import io
+        import time
+        write_scores([{
+            "epoch": time.time() - 5 * 3600,
+            "word_count": 50,
+            "answer_position": 0,
+            "padding_count": 0,
+            "info_density": 0.65,
+        }])
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({"source": "startup"})))
+        inject.main()
+        assert "7d:" in capsys.readouterr().out
+
 
 class TestPreviousSessionSummary:
     def _run_inject_main(self, monkeypatch, capsys):
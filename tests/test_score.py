@@ -31,6 +31,33 @@ class TestFillerDetection:
         assert "Let me know if" in phrases
         assert "I'd be happy to" in phrases
 
+    def test_nested_phrases_count_per_pattern(self):
+        """A phrase matched by two patterns counts once for each."""
+        count, phrases = count_filler_phrases("I hope this helps. That's a great question.")
+        assert count == 4
+        assert sorted(phrases) == ["I hope this helps", "That's a great question",
+                                   "great question", "hope this helps"]
+
+    def test_phrases_in_pattern_order(self):
+        """Phrases are listed by FILLER_PATTERNS order, then position in the text."""
+        text = "Let me know if it fails. Great question. Let me know if not. Hope this helps"
+        count, phrases = count_filler_phrases(text)
+        assert phrases == ["Great question", "Let me know if", "Let me know if",
+                           "Hope this helps"]
+
+    def test_patterns_survive_lowercasing(self):
+        """Patterns are compiled lowercased; uppercase escapes would change meaning."""
+        import re
+        from score import FILLER_PATTERNS, PREAMBLE_PATTERNS
+        for p in FILLER_PATTERNS + PREAMBLE_PATTERNS:
+            assert not re.search(r"\\[A-Z]", p), p
+
+    def test_length_changing_lowercase_falls_back(self):
+        """Text with "İ" (lowercases to two chars) still matches case-insensitively."""
+        count, phrases = count_filler_phrases("İstanbul. GREAT QUESTION! Hope this helps")
+        assert count == 2
+        assert phrases == ["GREAT QUESTION", "Hope this helps"]
+
     def test_case_insensitive(self):
         text = "great question! i'd be happy to help."
         count, phrases = count_filler_phrases(text)
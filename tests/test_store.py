@@ -23,6 +23,22 @@ class TestScoreLedger:
         assert entry["word_count"] == 42
         assert "epoch" in entry
 
+    def test_short_writes_completed(self):
+        """append_lines' raw writes are retried until every byte lands."""
+        import compat
+
+        class ShortWriter:
+            def __init__(self):
+                self.data = b""
+
+            def write(self, b):
+                self.data += bytes(b[:3])
+                return min(3, len(b))
+
+        f = ShortWriter()
+        compat._write_all(f, b'{"epoch": 1}\n')
+        assert f.data == b'{"epoch": 1}\n'
+
     def test_multiple_appends(self, lcars_tmpdir):
         for i in range(3):
             store.append_score({"word_count": i})
@@ -50,6 +66,13 @@ class TestDriftFlagLifecycle:
         result = store.read_and_clear_drift_flag()
         assert result is None
 
+    def test_rewrite_replaces_whole_flag(self, lcars_tmpdir):
+        store.write_drift_flag({"severity": "high", "correction": "x" * 500})
+        store.write_drift_flag({"severity": "low"})
+
+        assert store.read_and_clear_drift_flag() == {"severity": "low"}
+        assert os.listdir(os.path.dirname(store.DRIFT_FILE)) == ["memory"]
+
 
 class TestRotation:
     def test_old_scores_removed(self, lcars_tmpdir):
@@ -85,6 +108,55 @@ class TestRotation:
         # File should still be readable
         assert os.path.exists(store.SCORES_FILE)
 
+    def test_kept_lines_preserved_verbatim(self, lcars_tmpdir):
+        """Rotation copies surviving lines byte-for-byte, across chunk boundaries."""
+        import compat
+        now = time.time()
+        old = "".join(json.dumps({"epoch": now - 40 * 86400, "i": i}) + "\n" for i in range(50))
+        new = "".join(json.dumps({"epoch": now - 60 + i, "i": i}) + "\n" for i in range(50))
+        with open(store.SCORES_FILE, "w") as f:
+            f.write(old + new)
+
+        compat.trim_expired(store.SCORES_FILE, now - 28 * 86400, chunk_size=7)
+
+        with open(store.SCORES_FILE) as f:
+            assert f.read() == new
+
+    def test_reader_keeps_old_file_across_trim(self, lcars_tmpdir):
+        """A reverse_lines reader mid-iteration is not cut off by a trim."""
+        import compat
+        now = time.time()
+        lines = [json.dumps({"epoch": now - 40 * 86400 + i, "i": i}) for i in range(3)]
+        lines += [json.dumps({"epoch": now - 60 + i, "i": i}) for i in range(3)]
+        with open(store.SCORES_FILE, "w") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+        reader = compat.reverse_lines(store.SCORES_FILE)
+        first = next(reader)
+        compat.trim_expired(store.SCORES_FILE, now - 28 * 86400)
+        store.append_score({"word_count": 1})
+
+        assert [first, *reader] == [line.encode() for line in reversed(lines)]
+        with open(store.SCORES_FILE) as f:
+            kept = f.read().splitlines()
+        assert kept[:3] == lines[3:]
+        assert json.loads(kept[3])["word_count"] == 1
+        assert sorted(os.listdir(os.path.dirname(store.SCORES_FILE))) == ["memory", "scores.jsonl"]
+
+    def test_nothing_expired_leaves_file(self, lcars_tmpdir):
+        line = json.dumps({"epoch": time.time(), "word_count": 5}) + "\n"
+        with open(store.SCORES_FILE, "w") as f:
+            f.write(line)
+
+        store.rotate_store()
+
+        with open(store.SCORES_FILE) as f:
+            assert f.read() == line
+
+    def test_missing_file(self, lcars_tmpdir):
+        store.rotate_store()
+        assert not os.path.exists(store.SCORES_FILE)
+
 
 class TestSessionMarker:
     def test_session_marker_appended(self, lcars_tmpdir):
@@ -161,3 +233,34 @@ class TestRollingStats:
     def test_no_scores_returns_none(self, lcars_tmpdir):
         stats = store.rolling_stats()
         assert stats is None
+
+    def test_reads_only_window(self, lcars_tmpdir):
+        """Entries before the window, even unparseable ones, are never read."""
+        now = time.time()
+        with open(store.SCORES_FILE, "a") as f:
+            f.write("not json\n")
+            f.write(json.dumps({"epoch": now - 30 * 86400, "word_count": 999}) + "\n")
+            f.write(json.dumps({"type": "session_start", "epoch": now - 60}) + "\n")
+            f.write(json.dumps({"epoch": now, "word_count": 40, "info_density": 0.5}) + "\n")
+
+        stats = store.rolling_stats(days=7)
+        assert stats["responses"] == 1
+        assert stats["avg_words"] == 40.0
+
+
+class TestLastScoreAge:
+    def test_long_last_line(self, lcars_tmpdir):
+        """The last entry is read whole even when it exceeds 4 KB."""
+        now = time.time()
+        with open(store.SCORES_FILE, "a") as f:
+            f.write(json.dumps({"epoch": now - 7200}) + "\n")
+            f.write(json.dumps({"epoch": now - 3600, "pad": "x" * 8000}) + "\n\n")
+
+        age = store.last_score_age_hours()
+        assert age is not None
+        assert 0.9 < age < 1.1
+
+    def test_missing_or_empty(self, lcars_tmpdir):
+        assert store.last_score_age_hours() is None
+        open(store.SCORES_FILE, "w").close()
+        assert store.last_score_age_hours() is None
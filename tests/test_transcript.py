@@ -0,0 +1,126 @@
+"""Tests for lib/transcript.py — transcript parsing."""
+
+import json
+
+import transcript
+
+
+def _assistant(*blocks):
+    return {"type": "assistant", "message": {"content": list(blocks)}}
+
+
+def _text(t):
+    return {"type": "text", "text": t}
+
+
+def _write_jsonl(path, entries):
+    path.write_text("".join(
+        (e if isinstance(e, str) else json.dumps(e)) + "\n" for e in entries
+    ))
+
+
+class TestExtractLastAssistantText:
+    def test_last_text_block_of_newest_message(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant(_text("first")),
+            {"type": "user", "message": {"content": "next"}},
+            _assistant(_text("second"), _text("third")),
+        ])
+        assert transcript.extract_last_assistant_text(str(path)) == "third"
+
+    def test_skips_trailing_entries_without_text(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant(_text("answer")),
+            _assistant({"type": "tool_use", "name": "Bash", "id": "1"}),
+            "not json with \"assistant\" in it",
+            {"type": "tool_result", "tool_use_id": "1"},
+        ])
+        assert transcript.extract_last_assistant_text(str(path)) == "answer"
+
+    def test_json_array_format(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps([_assistant(_text("a")), _assistant(_text("b"))]))
+        assert transcript.extract_last_assistant_text(str(path)) == "b"
+
+    def test_no_assistant_text(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [{"type": "user", "message": {"content": "hi"}}])
+        assert transcript.extract_last_assistant_text(str(path)) is None
+
+    def test_missing_or_empty(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        assert transcript.extract_last_assistant_text(str(path)) is None
+        path.write_text("")
+        assert transcript.extract_last_assistant_text(str(path)) is None
+
+
+class TestForwardPass:
+    def test_count_assistant_messages(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant(_text("a")),
+            _assistant({"type": "tool_use", "name": "Bash", "id": "1"}),
+            "{truncated",
+            _assistant(_text("b")),
+        ])
+        assert transcript.count_assistant_messages(str(path)) == 2
+
+    def test_extract_tool_calls(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant({"type": "tool_use", "name": "Bash", "id": "1"}),
+            {"type": "tool_result", "tool_use_id": "1", "is_error": True},
+            _assistant({"type": "tool_use", "name": "Read", "id": "2"}),
+        ])
+        calls = transcript.extract_tool_calls(str(path))
+        assert calls == [
+            {"name": "Bash", "id": "1", "success": False},
+            {"name": "Read", "id": "2"},
+        ]
+
+    def test_unparseable_array_falls_back_to_lines(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, ["[not an array", _assistant(_text("a"))])
+        assert transcript.count_assistant_messages(str(path)) == 1
+
+    def test_result_matches_only_its_own_call(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant(
+                {"type": "tool_use", "name": "Bash", "id": "1"},
+                {"type": "tool_use", "name": "Grep", "id": "2"},
+            ),
+            {"type": "tool_result", "tool_use_id": "2"},
+            {"type": "tool_result", "tool_use_id": "2", "is_error": True},
+            {"type": "tool_result", "tool_use_id": "9", "is_error": True},
+        ])
+        calls = transcript.extract_tool_calls(str(path))
+        assert calls == [
+            {"name": "Bash", "id": "1"},
+            {"name": "Grep", "id": "2", "success": True},
+        ]
+
+    def test_duplicate_and_missing_ids(self, tmp_path):
+        """Each result goes to the most recent unmatched call with its id."""
+        path = tmp_path / "t.jsonl"
+        _write_jsonl(path, [
+            _assistant(
+                {"type": "tool_use", "name": "Bash", "id": "1"},
+                {"type": "tool_use", "name": "Grep", "id": "1"},
+                {"type": "tool_use", "name": "Read"},
+                {"type": "tool_use", "name": "Edit"},
+            ),
+            {"type": "tool_result", "tool_use_id": "1", "is_error": True},
+            {"type": "tool_result", "tool_use_id": "1"},
+            {"type": "tool_result"},
+            {"type": "tool_result", "is_error": True},
+        ])
+        calls = transcript.extract_tool_calls(str(path))
+        assert calls == [
+            {"name": "Bash", "id": "1", "success": True},
+            {"name": "Grep", "id": "1", "success": False},
+            {"name": "Read", "id": "", "success": False},
+            {"name": "Edit", "id": "", "success": True},
+        ]